@@ -0,0 +1,145 @@
+"""Capacity harness: thousands of headless ChatClients against one chat server.
+
+Run from the repository root:
+
+    python -m benchmarks.chat_load_bench --clients 10000 --room-size 100 --rate 2 --seconds 10
+
+Starts chat_server.py in a subprocess on a free port (--in-process runs it on
+the harness's own loop instead), connects --clients ChatClients from this
+process, splits them into rooms of --room-size, and has one client per room
+send --rate timestamped messages per second for --seconds. Reports connect
+rate, delivered messages per second and delivery latency percentiles.
+"""
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from chat_client import ChatClient
+from chat_protocol import MESSAGE, NOTICE
+from chat_server import ChatServer
+
+SERVER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "chat_server.py")
+STAMP = "t:"
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+
+def start_server_process(queue_size):
+    process = subprocess.Popen(
+        [sys.executable, "-u", SERVER, "--host", "127.0.0.1", "--port", "0", "--queue-size", str(queue_size)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    line = process.stdout.readline()  # "Chat server listening on 127.0.0.1:<port>"
+    return process, int(line.rsplit(":", 1)[1])
+
+
+class LoadClient:
+    def __init__(self, number, room, latencies):
+        self.room = room
+        self.latencies = latencies
+        self.in_room = asyncio.Event()
+        self.client = ChatClient(f"load{number}", on_message=self.on_message)
+
+    def on_message(self, msg_type, text):
+        if msg_type == MESSAGE:
+            _, _, stamp = text.partition(STAMP)
+            if stamp:
+                self.latencies.append((time.perf_counter_ns() - int(stamp)) / 1e6)
+        elif msg_type == NOTICE and text.startswith(f"Connected to {self.room} "):
+            self.in_room.set()
+
+    async def connect(self, port):
+        await self.client.connect("127.0.0.1", port)
+        await self.client.joined.wait()
+        self.client.send(f"/join {self.room}")
+        await self.in_room.wait()
+
+    async def send_loop(self, rate, seconds):
+        interval = 1 / rate
+        started = time.perf_counter()
+        sent = 0
+        while time.perf_counter() - started < seconds:
+            self.client.send(f"{STAMP}{time.perf_counter_ns()}")
+            sent += 1
+            await asyncio.sleep(max(0, started + sent * interval - time.perf_counter()))
+        return sent
+
+
+async def run(args):
+    server = None
+    if args.in_process:
+        server = ChatServer("127.0.0.1", 0, queue_size=args.queue_size)
+        await server.start()
+        port = server.port
+    else:
+        process, port = start_server_process(args.queue_size)
+
+    latencies = []
+    clients = [LoadClient(i, f"room{i // args.room_size}", latencies) for i in range(args.clients)]
+    try:
+        started = time.perf_counter()
+        for i in range(0, len(clients), args.connect_batch):
+            await asyncio.gather(*(c.connect(port) for c in clients[i:i + args.connect_batch]))
+        connect_time = time.perf_counter() - started
+
+        senders = clients[::args.room_size]
+        started = time.perf_counter()
+        sent = sum(await asyncio.gather(*(s.send_loop(args.rate, args.seconds) for s in senders)))
+        expected = sum(min(args.room_size, len(clients) - i) for i in range(0, len(clients), args.room_size))
+        expected = expected * args.rate * args.seconds
+        deadline = time.perf_counter() + 10
+        while len(latencies) < sent * args.room_size and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        elapsed = time.perf_counter() - started
+    finally:
+        # Server first, so it isn't left writing "left the room" notices to closed sockets
+        if server is not None:
+            await server.stop()
+        else:
+            process.terminate()
+            process.wait()
+        await asyncio.gather(*(c.client.close() for c in clients), return_exceptions=True)
+
+    print(f"{args.clients} clients in rooms of {args.room_size}, {len(senders)} senders at {args.rate} msg/s")
+    print(f"  connect+join: {connect_time:.1f} s ({args.clients / connect_time:,.0f} clients/s)")
+    print(f"  sent {sent} messages, delivered {len(latencies)} of ~{expected:.0f} "
+          f"({len(latencies) / elapsed:,.0f} deliveries/s)")
+    print(f"  latency ms: p50 {percentile(latencies, 50):.1f}  p90 {percentile(latencies, 90):.1f}  "
+          f"p99 {percentile(latencies, 99):.1f}  max {max(latencies, default=0):.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--room-size", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=2, help="messages per second per sender")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--connect-batch", type=int, default=500)
+    parser.add_argument("--queue-size", type=int, default=1024)
+    parser.add_argument("--in-process", action="store_true", help="run the server on the harness's loop")
+    args = parser.parse_args()
+
+    limit = raise_fd_limit()
+    if args.clients + 100 > limit:
+        sys.exit(f"open file limit is {limit}, too low for {args.clients} clients")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
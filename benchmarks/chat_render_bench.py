@@ -0,0 +1,101 @@
+"""UI responsiveness benchmark for ChatGUI's batched renderer.
+
+Run from the repository root (needs a display):
+
+    python -m benchmarks.chat_render_bench --rate 50000 --seconds 10
+
+A producer thread pushes messages into ChatGUI.display_message at the given
+rate while a 10 ms Tk heartbeat records how late the main loop runs it. The
+report shows heartbeat lag percentiles (how frozen the window feels), render
+throughput and the number of lines left in the widget.
+"""
+import argparse
+import importlib.util
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+HEARTBEAT_MS = 10
+
+
+def load_chat_app():
+    path = Path(__file__).resolve().parent.parent / "chat-app.py"
+    spec = importlib.util.spec_from_file_location("chat_app", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def producer(gui, rate, seconds, stop):
+    # Push in 1 ms slices so the offered load is smooth rather than one burst
+    per_slice = max(1, rate // 1000)
+    sent = 0
+    started = time.perf_counter()
+    while not stop.is_set():
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds:
+            break
+        target = int(elapsed * rate) + per_slice
+        while sent < target:
+            gui.display_message(f"user{sent % 97}: message number {sent}")
+            sent += 1
+        time.sleep(0.001)
+    return sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=int, default=50_000, help="messages per second")
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    chat_app = load_chat_app()
+    # A scratch transcript, so the fake messages stay out of the real chat history
+    scratch = tempfile.TemporaryDirectory()
+    gui = chat_app.ChatGUI(nickname="bench", transcript_dir=scratch.name)
+    lags = []
+    stop = threading.Event()
+    result = {}
+
+    def heartbeat(expected):
+        now = time.perf_counter()
+        lags.append((now - expected) * 1000)
+        if stop.is_set():
+            gui.root.quit()
+        else:
+            gui.root.after(HEARTBEAT_MS, heartbeat, now + HEARTBEAT_MS / 1000)
+
+    def run_producer():
+        result["sent"] = producer(gui, args.rate, args.seconds, stop)
+        # Let the last batch render before the heartbeat stops the main loop
+        time.sleep(chat_app.DRAIN_INTERVAL_MS * 4 / 1000)
+        stop.set()
+
+    gui.root.after(HEARTBEAT_MS, heartbeat, time.perf_counter() + HEARTBEAT_MS / 1000)
+    threading.Thread(target=run_producer, daemon=True).start()
+    started = time.perf_counter()
+    gui.root.mainloop()
+    elapsed = time.perf_counter() - started
+
+    lines = int(gui.chat_area.index("end-1c").split(".")[0]) - 1
+    print(f"offered:   {result.get('sent', 0):,} messages in {args.seconds:.0f}s "
+          f"({result.get('sent', 0) / elapsed:,.0f} msg/s)")
+    print(f"backlog:   {len(gui.inbox):,} messages still queued")
+    print(f"widget:    {lines:,} lines (cap {chat_app.MAX_LINES:,})")
+    print(f"heartbeat: p50 {percentile(lags, 50):.1f} ms, p99 {percentile(lags, 99):.1f} ms, "
+          f"max {max(lags, default=0):.1f} ms late ({len(lags)} ticks)")
+    gui.transcript.close()
+    gui.root.destroy()
+    scratch.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Load generator for chat_server.py.
+
+Run from the repository root:
+
+    python -m benchmarks.chat_server_bench --clients 10 100 1000
+
+For every client count an in-process server is started on a free port, that
+many clients join the lobby and a few of them stream timestamped messages.
+Reports delivered messages per second and p50/p99 delivery latency.
+"""
+import argparse
+import asyncio
+import time
+
+from chat_protocol import MESSAGE, NICK, NOTICE, FrameDecoder, encode_frame
+from chat_server import ChatServer
+
+PREFIX = "bench: "
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(len(values) * pct / 100))
+    return values[index]
+
+
+class BenchClient:
+    def __init__(self, latencies):
+        self.latencies = latencies
+        self.decoder = FrameDecoder()
+        self.received = 0
+
+    async def connect(self, host, port):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(encode_frame(NICK, "bench"))
+        await self.writer.drain()
+        # Wait until the server has put us in the lobby
+        while not any(t == NOTICE for t, _ in self.decoder.feed(await self.reader.read(4096))):
+            pass
+
+    async def read_loop(self):
+        while True:
+            data = await self.reader.read(65536)
+            if not data:
+                return
+            now = time.perf_counter_ns()
+            for msg_type, text in self.decoder.feed(data):
+                if msg_type == MESSAGE and text.startswith(PREFIX):
+                    self.latencies.append((now - int(text[len(PREFIX):])) / 1e6)
+                    self.received += 1
+
+    async def send_loop(self, count, batch=10):
+        # Open loop: frames are self-delimiting, so senders don't wait for echoes
+        for _ in range(0, count, batch):
+            self.writer.write(b"".join(
+                encode_frame(MESSAGE, str(time.perf_counter_ns())) for _ in range(batch)
+            ))
+            await self.writer.drain()
+            await asyncio.sleep(0)
+
+
+async def run_round(num_clients, senders, messages):
+    server = ChatServer('127.0.0.1', 0, queue_size=1024)
+    await server.start()
+    latencies = []
+    clients = [BenchClient(latencies) for _ in range(num_clients)]
+
+    started = time.perf_counter()
+    for i in range(0, num_clients, 200):
+        await asyncio.gather(*(c.connect('127.0.0.1', server.port) for c in clients[i:i + 200]))
+    connect_time = time.perf_counter() - started
+
+    readers = [asyncio.create_task(c.read_loop()) for c in clients]
+    started = time.perf_counter()
+    await asyncio.gather(*(c.send_loop(messages) for c in clients[:senders]))
+    # Give the remaining fan-out a moment to land
+    expected = senders * messages * num_clients
+    deadline = time.perf_counter() + 10
+    while sum(c.received for c in clients) < expected and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    delivered = sum(c.received for c in clients)
+
+    for task in readers:
+        task.cancel()
+    for c in clients:
+        c.writer.close()
+    await server.stop()
+
+    return {
+        "clients": num_clients,
+        "connect_s": connect_time,
+        "delivered": delivered,
+        "expected": expected,
+        "msgs_per_s": delivered / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "slow_disconnects": server.slow_disconnects,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--senders", type=int, default=4)
+    parser.add_argument("--messages", type=int, default=500, help="messages per sender")
+    args = parser.parse_args()
+
+    print(f"{'clients':>8} {'connect s':>10} {'delivered':>12} {'msgs/s':>12} {'p50 ms':>8} {'p99 ms':>8} {'dropped':>8}")
+    for n in args.clients:
+        r = asyncio.run(run_round(n, min(args.senders, n), args.messages))
+        print(f"{r['clients']:>8} {r['connect_s']:>10.2f} {r['delivered']:>6}/{r['expected']:<6}"
+              f" {r['msgs_per_s']:>11.0f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['slow_disconnects']:>8}")
+
+
+if __name__ == "__main__":
+    main()
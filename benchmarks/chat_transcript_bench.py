@@ -0,0 +1,90 @@
+"""Memory and scrollback latency of the on-disk chat transcript.
+
+Run from the repository root:
+
+    python -m benchmarks.chat_transcript_bench --messages 1000000
+
+Writes the given number of messages to a Transcript in a scratch directory
+in drain-sized batches, then measures: reopening it (what ChatGUI does on
+start), fetching a PAGE_LINES page at random positions (what scrolling past
+the top of the widget costs), a full-transcript search, and the peak Python
+heap for each, next to what holding the same history in a list takes.
+"""
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+
+from chat_transcript import Transcript
+
+PAGE_LINES = 500  # same as chat-app.py
+BATCH = 500
+
+
+def message(i):
+    return f"user{i % 97}: message number {i} with a little bit of text to make it realistic"
+
+
+def peak(func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    _, top = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, top / 2**20
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    _, _, in_memory = peak(lambda: [message(i) for i in range(args.messages)])
+
+    with tempfile.TemporaryDirectory() as directory:
+        transcript = Transcript(directory)
+        started = time.perf_counter()
+        for start in range(0, args.messages, BATCH):
+            transcript.extend(message(i) for i in range(start, min(start + BATCH, args.messages)))
+            transcript.flush()
+        write = time.perf_counter() - started
+        transcript.close()
+
+        transcript, reopen, reopen_mb = peak(lambda: Transcript(directory))
+        assert len(transcript) == args.messages
+
+        rng = random.Random(1)
+        latencies = []
+        tracemalloc.start()
+        for _ in range(args.pages):
+            start = rng.randrange(max(1, args.messages - PAGE_LINES))
+            began = time.perf_counter()
+            page = transcript.read(start, start + PAGE_LINES)
+            latencies.append((time.perf_counter() - began) * 1000)
+            assert page[0] == message(start)
+        _, page_mb = tracemalloc.get_traced_memory()
+        page_mb /= 2**20
+        tracemalloc.stop()
+
+        hits, search, search_mb = peak(lambda: sum(1 for _ in transcript.search("number 4242")))
+        transcript.close()
+
+    print(f"{args.messages} messages")
+    print(f"  write {args.messages / write:,.0f} msg/s ({write:.1f} s)")
+    print(f"  history as a Python list: {in_memory:.0f} MB")
+    print(f"  reopen: {reopen * 1000:.0f} ms, peak {reopen_mb:.1f} MB")
+    print(f"  page of {PAGE_LINES}: p50 {percentile(latencies, 50):.2f} ms, "
+          f"p99 {percentile(latencies, 99):.2f} ms, peak {page_mb:.1f} MB")
+    print(f"  search: {hits} hits in {search * 1000:.0f} ms, peak {search_mb:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
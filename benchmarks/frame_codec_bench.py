@@ -0,0 +1,72 @@
+"""Throughput microbenchmark for chat_protocol.
+
+Run from the repository root:
+
+    python -m benchmarks.frame_codec_bench
+
+Encodes a stream of chat frames, then decodes it again fed in chunks of
+different sizes, reporting frames/s and MB/s for each chunk size. The old
+"one recv() is one message" approach is included as a reference point.
+"""
+import argparse
+import random
+import time
+
+from chat_protocol import MESSAGE, FrameDecoder, encode_frame
+
+
+def make_messages(count, seed=1):
+    rng = random.Random(seed)
+    words = ["hello", "world", "ok", "lunch?", "héllo", "naïve", "日本語", "🙂", "ping", "deploy"]
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(1, 30))) for _ in range(count)]
+
+
+def bench_encode(messages):
+    started = time.perf_counter()
+    stream = b"".join(encode_frame(MESSAGE, m) for m in messages)
+    return stream, time.perf_counter() - started
+
+
+def bench_decode(stream, chunk_size):
+    decoder = FrameDecoder()
+    view = memoryview(stream)
+    frames = 0
+    started = time.perf_counter()
+    for pos in range(0, len(stream), chunk_size):
+        frames += len(decoder.feed(view[pos:pos + chunk_size]))
+    return frames, time.perf_counter() - started
+
+
+def bench_raw_chunks(stream, chunk_size):
+    # What ChatGUI used to do: decode every recv() chunk as if it were a message
+    view = memoryview(stream)
+    chunks = 0
+    started = time.perf_counter()
+    for pos in range(0, len(stream), chunk_size):
+        bytes(view[pos:pos + chunk_size]).decode('utf-8', errors='replace')
+        chunks += 1
+    return chunks, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--chunks", type=int, nargs="+", default=[64, 1024, 4096, 65536])
+    args = parser.parse_args()
+
+    messages = make_messages(args.messages)
+    stream, elapsed = bench_encode(messages)
+    mb = len(stream) / 1e6
+    print(f"encode: {len(messages)} frames, {mb:.1f} MB in {elapsed:.3f}s "
+          f"({len(messages) / elapsed:,.0f} frames/s, {mb / elapsed:.1f} MB/s)")
+
+    print(f"{'chunk':>8} {'frames/s':>14} {'MB/s':>8} {'raw chunks/s':>14}")
+    for chunk_size in args.chunks:
+        frames, elapsed = bench_decode(stream, chunk_size)
+        assert frames == len(messages), (frames, len(messages))
+        chunks, raw_elapsed = bench_raw_chunks(stream, chunk_size)
+        print(f"{chunk_size:>8} {frames / elapsed:>14,.0f} {mb / elapsed:>8.1f} {chunks / raw_elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Measure `todo.py import` on large NDJSON and CSV files.
+
+Run from the repository root:
+
+    python -m benchmarks.todo_import_bench --sizes 100000 1000000 3000000
+
+For each size a file of random tasks is written to a scratch directory and
+imported into a fresh sqlite database by running todo.py as a child process,
+whose wall time and peak RSS are reported. Peak RSS staying level as the
+size grows is the point of the streaming import. The time parser is also
+compared against calling strptime for every record.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from todo_storage import TIME_FORMAT, _parse_time, parse_time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs todo.py and prints its peak RSS. VmHWM belongs to the new process image;
+# ru_maxrss would include the memory of this (much bigger) parent from the fork.
+CHILD = """
+import runpy, sys
+sys.argv = sys.argv[1:]
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+finally:
+    with open("/proc/self/status") as f:
+        print([line.split()[1] for line in f if line.startswith("VmHWM")][0])
+"""
+
+
+def make_times(count, seed=1):
+    # Due times land on 15-minute marks within a year, so they repeat the way real lists do
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    for _ in range(count):
+        if rng.random() < 0.8:
+            yield (start + timedelta(minutes=15 * rng.randrange(35040))).strftime(TIME_FORMAT)
+        else:
+            yield None
+
+
+def write_file(path, fmt, count):
+    states = ("Pending", "Done", "Overdue")
+    rng = random.Random(2)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            f.write("task,time,state\n")
+            for i, when in enumerate(make_times(count), 1):
+                f.write(f"task {i},{when or ''},{rng.choice(states)}\n")
+        else:
+            for i, when in enumerate(make_times(count), 1):
+                f.write(json.dumps({"task": f"task {i}", "time": when, "state": rng.choice(states)}) + "\n")
+
+
+def run_import(directory, path):
+    env = dict(os.environ, PYTHONPATH=ROOT, TODO_BACKEND="sqlite")
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", CHILD, os.path.join(ROOT, "todo.py"), "import", path],
+                          cwd=directory, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    return elapsed, int(proc.stdout.split()[-1]) / 1024  # VmHWM is in KiB
+
+
+def measure_parse(count):
+    values = [v for v in make_times(count) if v]
+    started = time.perf_counter()
+    for value in values:
+        datetime.strptime(value, TIME_FORMAT)
+    strptime = time.perf_counter() - started
+    _parse_time.cache_clear()
+    started = time.perf_counter()
+    for value in values:
+        parse_time(value)
+    cached = time.perf_counter() - started
+    return len(values), strptime, cached
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--formats", nargs="+", choices=("ndjson", "csv"), default=["ndjson", "csv"])
+    args = parser.parse_args()
+
+    count, strptime, cached = measure_parse(max(args.sizes))
+    print(f"parse {count} times: strptime {strptime:.2f}s, parse_time {cached:.2f}s "
+          f"({strptime / cached:.1f}x)\n")
+
+    print(f"{'tasks':>9} {'format':>7} {'import s':>9} {'tasks/s':>10} {'peak MiB':>9}")
+    for size in args.sizes:
+        for fmt in args.formats:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, f"tasks.{fmt}")
+                write_file(path, fmt, size)
+                elapsed, peak = run_import(directory, path)
+            print(f"{size:>9} {fmt:>7} {elapsed:>9.2f} {size / elapsed:>10.0f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Wakeup latency and CPU cost of todo_scheduler with many tasks.
+
+Run from the repository root:
+
+    python -m benchmarks.todo_scheduler_bench --tasks 1000000
+
+Schedules the given number of far-future tasks plus a handful that fall due
+over the next few seconds, runs the scheduler thread, and reports:
+
+  * bulk load and per-update cost
+  * how late each near-term reminder fired (wakeup latency)
+  * process CPU time spent while the scheduler only waits
+  * for comparison, the cost of one pass of the old 60-second list scan
+"""
+import argparse
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from todo_scheduler import ReminderScheduler
+from todo_store import Task
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def old_scan(tasks, now):
+    # The body of the previous reminder_worker loop, minus the prints
+    for t in tasks:
+        if t.time and t.state == "Pending":
+            if now >= t.time:
+                pass
+            elif now + timedelta(minutes=5) >= t.time:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--near", type=int, default=50, help="tasks due within the next seconds")
+    parser.add_argument("--idle", type=float, default=3.0, help="seconds of idle CPU measurement")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    now = datetime.now()
+    tasks = [
+        Task(i, f"task {i}", now + timedelta(days=1, minutes=rng.randrange(525600)))
+        for i in range(args.tasks)
+    ]
+
+    lateness = []
+
+    def on_due(task):
+        lateness.append((datetime.now() - task.time).total_seconds() * 1000)
+        task.state = "Overdue"
+
+    scheduler = ReminderScheduler(on_warning=lambda task: None, on_due=on_due)
+
+    started = time.perf_counter()
+    scheduler.update_many(tasks)
+    print(f"bulk load:      {args.tasks:,} tasks in {time.perf_counter() - started:.2f}s")
+
+    sample = rng.sample(tasks, min(10_000, len(tasks)))
+    started = time.perf_counter()
+    for task in sample:
+        task.time += timedelta(minutes=1)
+        scheduler.update(task)
+    print(f"update:         {(time.perf_counter() - started) / len(sample) * 1e6:.2f} µs per change")
+
+    worker = threading.Thread(target=scheduler.run_forever, daemon=True)
+    worker.start()
+
+    # Idle: nothing is due for a day, the worker should be parked on the condition
+    cpu = time.process_time()
+    time.sleep(args.idle)
+    idle_cpu = time.process_time() - cpu
+    print(f"idle CPU:       {idle_cpu * 1000:.1f} ms over {args.idle:.0f}s")
+
+    # Near-term tasks, added while the worker is asleep
+    base = datetime.now() + timedelta(seconds=1)
+    near = [
+        Task(args.tasks + i, f"near {i}", base + timedelta(milliseconds=rng.randrange(3000)))
+        for i in range(args.near)
+    ]
+    for task in near:
+        scheduler.update(task)
+    deadline = time.time() + 10
+    while len(lateness) < args.near and time.time() < deadline:
+        time.sleep(0.05)
+    scheduler.stop()
+    print(f"wakeup latency: p50 {percentile(lateness, 50):.2f} ms, p99 {percentile(lateness, 99):.2f} ms, "
+          f"max {max(lateness, default=0):.2f} ms ({len(lateness)}/{args.near} fired)")
+
+    started = time.perf_counter()
+    old_scan(tasks, datetime.now())
+    print(f"old full scan:  {(time.perf_counter() - started) * 1000:.0f} ms per 60s pass, "
+          f"reminders up to 60s late")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compare todo.py storage backends.
+
+Run from the repository root:
+
+    python -m benchmarks.todo_storage_bench --sizes 1000 100000 1000000
+
+For each list size both backends are filled in a scratch directory, then the
+time to load the list and the mean latency of single-task edits (the same
+update mark_done() makes) are measured.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from todo_storage import JsonBackend, SqliteBackend
+from todo_store import Task
+
+
+def make_tasks(count, seed=1):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    states = ["Pending", "Done", "Overdue"]
+    return [
+        Task(
+            i,
+            f"task {i}",
+            start + timedelta(minutes=rng.randrange(525600)) if rng.random() < 0.8 else None,
+            rng.choice(states),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def open_json(directory, tasks):
+    backend = JsonBackend(os.path.join(directory, "todo.json"))
+    backend.add_many(tasks)
+    return backend
+
+
+def open_sqlite(directory, tasks):
+    backend = SqliteBackend(os.path.join(directory, "todo.db"), os.path.join(directory, "missing.json"))
+    backend.add_many(tasks)
+    return backend
+
+
+def measure(opener, tasks, edits):
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        backend = opener(directory, [Task(t.id, t.task, t.time, t.state) for t in tasks])
+        fill = time.perf_counter() - started
+
+        started = time.perf_counter()
+        loaded = backend.load()
+        load = time.perf_counter() - started
+
+        rng = random.Random(2)
+        started = time.perf_counter()
+        deadline = started + 30
+        done = 0
+        for _ in range(edits):
+            task = rng.choice(loaded)
+            task.state = "Done"
+            backend.update(task)
+            done += 1
+            if time.perf_counter() > deadline:
+                break
+        edit = (time.perf_counter() - started) / done
+        backend.close()
+    return fill, load, edit, done
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--edits", type=int, default=200, help="edits per run (capped at ~30s)")
+    args = parser.parse_args()
+
+    print(f"{'tasks':>9} {'backend':>8} {'fill s':>8} {'load s':>8} {'edit ms':>10} {'edits':>6}")
+    for size in args.sizes:
+        tasks = make_tasks(size)
+        for name, opener in (("json", open_json), ("sqlite", open_sqlite)):
+            fill, load, edit, done = measure(opener, tasks, args.edits)
+            print(f"{size:>9} {name:>8} {fill:>8.2f} {load:>8.2f} {edit * 1000:>10.3f} {done:>6}")
+
+
+if __name__ == "__main__":
+    main()
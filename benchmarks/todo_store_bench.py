@@ -0,0 +1,87 @@
+"""Memory and lookup cost of TaskStore versus the old list of dicts.
+
+Run from the repository root:
+
+    python -m benchmarks.todo_store_bench --tasks 1000000
+
+Builds the same tasks both ways under tracemalloc and times the lookups the
+menu and the reminder thread do: find a task by its id and collect every task
+in a given state.
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from todo_store import STATES, Task, TaskStore
+
+
+class NullBackend:
+    def load(self):
+        return []
+
+    def add_many(self, tasks):
+        pass
+
+
+def build_dicts(rows):
+    return [{"id": i, "task": text, "time": when, "state": state} for i, text, when, state in rows]
+
+
+def build_store(rows):
+    store = TaskStore(NullBackend())
+    store.add_many([Task(None, text, when, state) for _, text, when, state in rows])
+    return store
+
+
+def measure_memory(build, rows):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build(rows)
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def timed(label, count, func):
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<34} {elapsed / count * 1e6:>12.2f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    start = datetime(2025, 1, 1)
+    # Shared strings and datetimes, so only the containers are measured
+    rows = [
+        (i, f"task {i}", start + timedelta(minutes=i), rng.choice(STATES))
+        for i in range(1, args.tasks + 1)
+    ]
+
+    todo, dict_bytes, dict_time = measure_memory(build_dicts, rows)
+    store, store_bytes, store_time = measure_memory(build_store, rows)
+    print(f"{args.tasks:,} tasks")
+    print(f"  list of dicts: {dict_bytes / 1e6:>8.1f} MB  built in {dict_time:.2f}s")
+    print(f"  TaskStore:     {store_bytes / 1e6:>8.1f} MB  built in {store_time:.2f}s  (incl. id index and state sets)")
+
+    ids = [rng.randrange(1, args.tasks + 1) for _ in range(args.lookups)]
+    print("lookups (mean per call)")
+    timed("list of dicts: find by id (scan)", len(ids),
+          lambda: [next(t for t in todo if t["id"] == i) for i in ids])
+    timed("TaskStore: get(id)", len(ids), lambda: [store.get(i) for i in ids])
+    timed("list of dicts: tasks in state", 10,
+          lambda: [[t for t in todo if t["state"] == "Pending"] for _ in range(10)])
+    timed("TaskStore: count(state)", 10, lambda: [store.count("Pending") for _ in range(10)])
+    timed("TaskStore: with_state(state)", 10, lambda: [store.with_state("Pending") for _ in range(10)])
+
+
+if __name__ == "__main__":
+    main()
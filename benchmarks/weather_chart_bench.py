@@ -0,0 +1,105 @@
+"""Chart refresh cost: clear-and-rebuild vs ForecastChart.update.
+
+Run from the repository root:
+
+    python -m benchmarks.weather_chart_bench --points 40 1000 5000
+
+Renders off-screen with the Agg backend (the same renderer TkAgg uses). The
+old path clears the axes, re-plots, re-applies formatting and redraws on every
+refresh. The new path swaps the line data and redraws. Refreshes alternate
+between two series with the same range (the common auto-refresh case) and,
+separately, between series whose range moves so the view has to rescale.
+The "coalesced" column is what draw_idle buys when several updates land in
+one Tk frame: N updates, one render.
+"""
+import argparse
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.dates as mdates
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from weather_chart import ForecastChart
+
+
+def series(points, shift=0.0, offset_hours=0):
+    start = np.datetime64("2025-01-01T00:00", "s") + np.timedelta64(offset_hours, "h")
+    step = 3 if points <= 40 else 1
+    times = start + np.arange(points) * np.timedelta64(step, "h")
+    temps = 15 + 8 * np.sin(np.arange(points) / 4 + shift)
+    return times, temps
+
+
+def legacy_refresh(fig, ax, canvas, times, temps):
+    # Same steps as the original update_chart
+    ax.clear()
+    ax.plot(times, temps, marker='o', linestyle='-', linewidth=2, markersize=4)
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%a %H:%M'))
+    ax.xaxis.set_major_locator(mdates.HourLocator(interval=6))
+    fig.autofmt_xdate()
+    ax.set_ylabel('Temperature (°C)')
+    ax.set_title('Temperature Forecast')
+    ax.grid(True, linestyle='--', alpha=0.7)
+    canvas.draw()
+
+
+def measure(refresh, datasets, refreshes):
+    started = time.perf_counter()
+    for i in range(refreshes):
+        refresh(*datasets[i % len(datasets)])
+    return (time.perf_counter() - started) / refreshes * 1000
+
+
+def run(points, moving, refreshes, burst):
+    if moving:
+        datasets = [series(points, 0.0, 0), series(points, 0.0, 3)]
+    else:
+        datasets = [series(points, 0.0), series(points, np.pi)]
+
+    fig = Figure(figsize=(8, 4), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    old = measure(lambda t, v: legacy_refresh(fig, ax, canvas, t, v), datasets, refreshes)
+
+    fig = Figure(figsize=(8, 4), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    chart = ForecastChart(fig)
+
+    def refresh(times, temps):
+        chart.update(times, temps, '°C')
+        canvas.draw()
+
+    refresh(*datasets[0])
+    new = measure(refresh, datasets, refreshes)
+
+    def coalesced(times, temps):
+        for _ in range(burst):
+            chart.update(times, temps, '°C')
+        canvas.draw()
+
+    grouped = measure(coalesced, datasets, refreshes) / burst
+    return old, new, grouped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, nargs="+", default=[40, 1000, 5000])
+    parser.add_argument("--refreshes", type=int, default=20)
+    parser.add_argument("--burst", type=int, default=5, help="updates per Tk frame for the coalesced column")
+    args = parser.parse_args()
+
+    print(f"{'points':>6} {'range':>7} {'rebuild ms':>11} {'set_data ms':>12} {'coalesced ms':>13}")
+    for points in args.points:
+        for moving in (False, True):
+            old, new, grouped = run(points, moving, args.refreshes, args.burst)
+            label = "moving" if moving else "same"
+            print(f"{points:>6} {label:>7} {old:>11.1f} {new:>12.1f} {grouped:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
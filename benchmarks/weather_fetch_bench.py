@@ -0,0 +1,114 @@
+"""End-to-end latency and UI responsiveness of the weather fetch path.
+
+Run from the repository root:
+
+    python -m benchmarks.weather_fetch_bench --delay 0.2
+
+Compares the old path (current weather, forecast and icon fetched one after
+the other on the UI thread) with FetchPipeline against a local stub server
+that adds --delay seconds to every response. A fake UI loop ticks every
+10 ms; the longest gap between ticks is how long the window would freeze.
+A burst of rapid searches checks that only the newest one gets rendered.
+"""
+import argparse
+import queue
+import time
+
+import requests
+
+from benchmarks.weather_stub import StubServer, fetch_bytes, fetch_json
+from weather_fetch import FetchPipeline
+
+TICK = 0.01
+
+
+class FakeUi:
+    """A main loop that runs posted callbacks and records how late each tick is."""
+
+    def __init__(self):
+        self.calls = queue.SimpleQueue()
+        self.max_gap = 0.0
+
+    def post(self, func, *args):
+        self.calls.put((func, args))
+
+    def run_until(self, done, timeout=30):
+        last = time.perf_counter()
+        deadline = last + timeout
+        while not done() and time.perf_counter() < deadline:
+            time.sleep(TICK)
+            while True:
+                try:
+                    func, args = self.calls.get_nowait()
+                except queue.Empty:
+                    break
+                func(*args)
+            now = time.perf_counter()
+            self.max_gap = max(self.max_gap, now - last)
+            last = now
+
+
+def sequential(stub, city):
+    # Same shape as the original get_weather_data + load_weather_icon
+    started = time.perf_counter()
+    params = {"q": city, "appid": "x", "units": "metric"}
+    current = requests.get(f"{stub.api_url}/weather", params=params).json()
+    requests.get(f"{stub.api_url}/forecast", params=params).json()
+    requests.get(f"{stub.icon_url}/{current['weather'][0]['icon']}@2x.png").content
+    elapsed = time.perf_counter() - started
+    return elapsed, elapsed  # the UI thread was blocked the whole time
+
+
+def pipelined(stub, city, searches=1):
+    ui = FakeUi()
+    pipeline = FetchPipeline(ui.post)
+    results = {}
+    rendered = []
+    started = time.perf_counter()
+
+    def search(name):
+        generation = pipeline.new_generation()
+        params = {"q": name, "appid": "x", "units": "metric"}
+
+        def on_current(data):
+            results["current"] = data
+            rendered.append(data["name"])
+            icon = data["weather"][0]["icon"]
+            pipeline.submit(generation, fetch_bytes, (f"{stub.icon_url}/{icon}@2x.png",),
+                            lambda body: results.__setitem__("icon", body), print)
+
+        pipeline.submit(generation, fetch_json, (f"{stub.api_url}/weather", params), on_current, print)
+        pipeline.submit(generation, fetch_json, (f"{stub.api_url}/forecast", params),
+                        lambda data: results.__setitem__("forecast", data), print)
+
+    for i in range(searches):
+        search(f"{city}{i}" if i < searches - 1 else city)
+    ui.run_until(lambda: len(results) == 3)
+    elapsed = time.perf_counter() - started
+    pipeline.shutdown()
+    return elapsed, ui.max_gap, rendered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--delay", type=float, default=0.2, help="seconds added to every stub response")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with StubServer(delay=args.delay) as stub:
+        seq = [sequential(stub, "Nairobi") for _ in range(args.runs)]
+        par = [pipelined(stub, "Nairobi") for _ in range(args.runs)]
+        _, _, rendered = pipelined(stub, "Nairobi", searches=5)
+
+    def mean(values):
+        return sum(values) / len(values) * 1000
+
+    print(f"stub delay {args.delay * 1000:.0f} ms per request, {args.runs} runs")
+    print(f"{'':12} {'end-to-end ms':>14} {'max UI freeze ms':>17}")
+    print(f"{'sequential':12} {mean([s[0] for s in seq]):>14.0f} {mean([s[1] for s in seq]):>17.0f}")
+    print(f"{'pipelined':12} {mean([p[0] for p in par]):>14.0f} {mean([p[1] for p in par]):>17.0f}")
+    print(f"5 rapid searches rendered: {rendered} (only the last should appear)")
+
+
+if __name__ == "__main__":
+    main()
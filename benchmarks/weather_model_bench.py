@@ -0,0 +1,94 @@
+"""Forecast parsing and daily aggregation: per-dict loops vs ForecastModel.
+
+Run from the repository root:
+
+    python -m benchmarks.weather_model_bench --points 40 384 --cities 1 50
+
+For each forecast length (40 = the free 5-day/3-hour endpoint, 384 = 16 days
+hourly) the old update_forecast/update_chart data preparation is timed against
+ForecastModel.from_json + daily() + datetimes(), once per city. Results are
+checked against each other before timing.
+"""
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.weather_stub import forecast_payload
+from weather_model import ForecastModel, to_datetime
+
+
+def legacy(data):
+    # Same work the original update_forecast and update_chart did
+    forecasts_by_day = {}
+    for forecast in data['list']:
+        date = forecast['dt_txt'].split(' ')[0]
+        if date not in forecasts_by_day:
+            forecasts_by_day[date] = []
+        forecasts_by_day[date].append(forecast)
+
+    days = []
+    for date, day_forecasts in forecasts_by_day.items():
+        temps = [f['main']['temp'] for f in day_forecasts]
+        weather_counts = {}
+        for f in day_forecasts:
+            condition = f['weather'][0]['main']
+            weather_counts[condition] = weather_counts.get(condition, 0) + 1
+        common_weather = max(weather_counts, key=weather_counts.get)
+        days.append((datetime.strptime(date, '%Y-%m-%d'), min(temps), max(temps), common_weather))
+
+    times = []
+    temps = []
+    for forecast in data['list']:
+        times.append(datetime.strptime(forecast['dt_txt'], '%Y-%m-%d %H:%M:%S'))
+        temps.append(forecast['main']['temp'])
+    return days, times, temps
+
+
+def columnar(data):
+    model = ForecastModel.from_json(data)
+    daily = model.daily()
+    return model, daily, model.datetimes()
+
+
+def check(data):
+    days, times, temps = legacy(data)
+    model, daily, datetimes = columnar(data)
+    assert [d[0] for d in days] == [to_datetime(s) for s in daily.start]
+    assert np.allclose([d[1] for d in days], daily.low)
+    assert np.allclose([d[2] for d in days], daily.high)
+    assert [d[3] for d in days] == [model.labels[c] for c in daily.condition]
+    assert times == [t.item() for t in datetimes]
+    assert np.allclose(temps, model.temps)
+
+
+def timed(func, payloads, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for data in payloads:
+            func(data)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, nargs="+", default=[40, 384])
+    parser.add_argument("--cities", type=int, nargs="+", default=[1, 50])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'points':>6} {'cities':>6} {'loops ms':>10} {'numpy ms':>10} {'speedup':>8}")
+    for points in args.points:
+        for cities in args.cities:
+            payloads = [forecast_payload(f"city{i}", points=points, now=1_700_000_000) for i in range(cities)]
+            check(payloads[0])
+            old = timed(legacy, payloads, args.repeat)
+            new = timed(columnar, payloads, args.repeat)
+            print(f"{points:>6} {cities:>6} {old * 1000:>10.2f} {new * 1000:>10.2f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
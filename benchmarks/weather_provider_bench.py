@@ -0,0 +1,73 @@
+"""Per-request latency with a pooled session vs a new connection per request.
+
+Run from the repository root:
+
+    python -m benchmarks.weather_provider_bench --requests 200
+
+Against the local stub server (plain HTTP on localhost, so no DNS or TLS:
+real OpenWeatherMap calls save more than this shows), times sequential
+weather requests made with requests.get, which opens a new connection each
+time as the app used to, and through WeatherProvider's shared session. The
+same requests are then replayed from a fixture directory recorded on the way,
+which is how the app runs with no network at all.
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+import requests
+
+from benchmarks.weather_stub import StubServer
+from weather_provider import FixtureProvider, WeatherProvider
+
+
+def timed(call, count):
+    latencies = []
+    for i in range(count):
+        started = time.perf_counter()
+        call(i)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def report(label, latencies, connections=None):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    opened = "" if connections is None else f"{connections:>12}"
+    print(f"{label:10} {p50:>8.2f} {p99:>8.2f} {opened}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--cities", type=int, default=10)
+    args = parser.parse_args()
+
+    cities = [f"City {i}" for i in range(args.cities)]
+    with StubServer() as stub, tempfile.TemporaryDirectory() as directory:
+        print(f"{args.requests} sequential requests")
+        print(f"{'':10} {'p50 ms':>8} {'p99 ms':>8} {'connections':>12}")
+
+        def unpooled(i):
+            params = {"q": cities[i % len(cities)], "appid": "x", "units": "metric"}
+            requests.get(f"{stub.api_url}/weather", params=params, timeout=10).json()
+
+        before = stub.connections
+        latencies = timed(unpooled, args.requests)
+        report("unpooled", latencies, stub.connections - before)
+
+        provider = WeatherProvider("x", api_url=stub.api_url, record_dir=directory)
+        before = stub.connections
+        latencies = timed(lambda i: provider.get("weather", {"q": cities[i % len(cities)]}), args.requests)
+        report("pooled", latencies, stub.connections - before)
+        provider.close()
+
+        fixtures = FixtureProvider(directory)
+        latencies = timed(lambda i: fixtures.get("weather", {"q": cities[i % len(cities)]}), args.requests)
+        report("fixtures", latencies, 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Replay recorded weather responses through weather-app.py's render path.
+
+Run from the repository root:
+
+    python -m benchmarks.weather_render_bench --cities 20 --rounds 5 --out render.prom
+
+Responses for --cities cities are recorded from the local stub server into a
+fixture directory and replayed with weather_perf span recording switched on.
+With a display the real WeatherApp runs against the fixtures
+(WEATHER_FIXTURES) in a scratch directory and searches every city --rounds
+times, pumping Tk until the search has rendered and the chart has drawn.
+Without one the same stages run headless: fixture decode, ForecastModel
+parsing, the forecast card rows, the chart on an Agg canvas and the icon
+decode. The span table is printed and, with --out, written as JSON or
+Prometheus text (*.prom). The first round includes one-off work such as
+creating the chart, so compare p50 rather than max between runs.
+"""
+import argparse
+import importlib.util
+import os
+import tempfile
+import time
+import tkinter
+
+from benchmarks.weather_stub import StubServer
+from weather_icons import ICON_CODES, IconCache
+from weather_model import ForecastModel, to_datetime
+from weather_perf import recorder, span, timed
+from weather_provider import FixtureProvider, WeatherProvider
+from weather_units import temperature_symbol
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "weather-app.py")
+SEARCH_TIMEOUT = 10
+
+
+def record_fixtures(directory, cities, points):
+    with StubServer(forecast_points=points) as stub:
+        provider = WeatherProvider("x", api_url=stub.api_url, icon_url=stub.icon_url, record_dir=directory)
+        for city in cities:
+            provider.get("weather", {"q": city})
+            provider.get("forecast", {"q": city})
+        for code in ICON_CODES:
+            provider.icon(code)
+        provider.close()
+
+
+def load_app():
+    spec = importlib.util.spec_from_file_location("weather_app", APP)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def replay_app(cities, rounds):
+    module = load_app()
+    root = module.tk.Tk()  # TclError without a display
+    app = module.WeatherApp(root)
+    try:
+        for _ in range(rounds):
+            for city in cities:
+                app.city_var.set(city)
+                app.get_weather_data()
+                deadline = time.monotonic() + SEARCH_TIMEOUT
+                while (app.pending_parts or app.chart is None) and time.monotonic() < deadline:
+                    root.update()
+                root.update()  # runs the chart's draw_idle
+    finally:
+        app.refresher.stop()
+        app.fetcher.shutdown()
+        app.icon_fetcher.shutdown()
+        app.watchlist_fetcher.shutdown()
+        app.watchlist.shutdown()
+        app.provider.close()
+        app.cache.close()
+        root.destroy()
+
+
+def replay_headless(fixtures, cities, rounds, directory):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from weather_chart import ForecastChart
+
+    provider = FixtureProvider(fixtures)
+    icons = IconCache(provider.icon, os.path.join(directory, "icons"))
+    os.makedirs(icons.directory, exist_ok=True)
+    fig = Figure(figsize=(8, 4), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    chart = ForecastChart(fig)
+    draw = timed("chart.draw", canvas.draw)
+    symbol = temperature_symbol("metric")
+    for _ in range(rounds):
+        for city in cities:
+            started = time.perf_counter_ns()
+            current, _ = provider.get("weather", {"q": city})
+            forecast, _ = provider.get("forecast", {"q": city})
+            with span("forecast.parse"):
+                model = ForecastModel.from_json(forecast)
+            with span("render.forecast"):
+                daily = model.daily()
+                rows = [(to_datetime(start).strftime('%a, %b %d'), model.labels[condition],
+                         f"High: {high:.1f}{symbol}", f"Low: {low:.1f}{symbol}")
+                        for start, low, high, condition in zip(daily.start, daily.low[:5], daily.high[:5],
+                                                               daily.condition)]
+            with span("render.chart"):
+                chart.update(model.datetimes(), model.temps, symbol)
+            draw()
+            icons.images.clear()  # decode from disk every time, as a cold start would
+            icons.load(current["weather"][0]["icon"])
+            recorder.record("search", time.perf_counter_ns() - started)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--points", type=int, default=40, help="forecast entries per city")
+    parser.add_argument("--headless", action="store_true", help="skip the Tk app even with a display")
+    parser.add_argument("--out", help="also write the spans here (*.prom for Prometheus text)")
+    args = parser.parse_args()
+
+    cities = [f"City {i}" for i in range(args.cities)]
+    recorder.enabled = True
+    with tempfile.TemporaryDirectory() as directory:
+        fixtures = os.path.join(directory, "fixtures")
+        record_fixtures(fixtures, cities, args.points)
+        recorder.reset()  # recording went through the same spans
+
+        mode = "headless"
+        if not args.headless:
+            cwd = os.getcwd()
+            os.environ["WEATHER_FIXTURES"] = fixtures
+            os.chdir(directory)  # settings, cache and icons land in the scratch directory
+            try:
+                replay_app(cities, args.rounds)
+                mode = "WeatherApp"
+            except tkinter.TclError as e:
+                print(f"no display ({e}), replaying headless")
+                recorder.reset()
+            finally:
+                os.chdir(cwd)
+        if mode == "headless":
+            replay_headless(fixtures, cities, args.rounds, directory)
+
+    print(f"{mode}: {args.cities} cities x {args.rounds} rounds, {args.points} forecast entries each\n")
+    print(recorder.summary())
+    if args.out:
+        print(f"\nwritten to {recorder.dump(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Startup cost of weather-app.py: import time and time to first paint.
+
+Run from the repository root:
+
+    python -m benchmarks.weather_startup_bench --max-import-ms 400
+
+Runs weather-app.py's module body in a fresh interpreter under -X importtime
+and reports the total and the heaviest imports. With a display available it
+also starts the app against recorded fixtures (no network, scratch working
+directory) and reports the time from process start to the window's first
+<Expose> and to the chart being ready. --max-import-ms makes the run fail
+when the import total regresses past the given budget.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "weather-app.py")
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+LOAD = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("weather_app", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+"""
+
+PAINT = LOAD + """
+import time
+started = float(sys.argv[2])
+root = module.tk.Tk()
+app = module.WeatherApp(root)
+marks = {}
+
+def mark(name):
+    marks.setdefault(name, (time.time() - started) * 1000)
+
+def check_chart():
+    if app.chart is not None:
+        mark("chart ready")
+        root.quit()
+    else:
+        root.after(5, check_chart)
+
+root.bind("<Expose>", lambda e: mark("first paint"), add="+")
+root.after(5, check_chart)
+root.after(20000, root.quit)
+root.mainloop()
+for name, ms in marks.items():
+    print(f"{name} {ms:.0f}")
+app.refresher.stop()
+"""
+
+
+def import_times():
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", LOAD, APP],
+                            capture_output=True, text=True, check=True)
+    top = []
+    for match in LINE.finditer(result.stderr):
+        _, cumulative, indent, name = match.groups()
+        if len(indent) == 1:  # top-level imports only; nested ones are inside their cumulative time
+            top.append((int(cumulative) / 1000, name))
+    return top
+
+
+def first_paint():
+    import time
+
+    from benchmarks.weather_stub import StubServer
+    from weather_provider import WeatherProvider
+
+    with tempfile.TemporaryDirectory() as directory:
+        fixtures = os.path.join(directory, "fixtures")
+        with StubServer() as stub:
+            provider = WeatherProvider("x", api_url=stub.api_url, icon_url=stub.icon_url, record_dir=fixtures)
+            provider.get("weather", {"q": "London"})
+            provider.get("forecast", {"q": "London"})
+            provider.close()
+        env = dict(os.environ, WEATHER_FIXTURES=fixtures,
+                   PYTHONPATH=os.pathsep.join([os.path.dirname(APP), os.environ.get("PYTHONPATH", "")]))
+        result = subprocess.run([sys.executable, "-c", PAINT, APP, repr(time.time())],
+                                capture_output=True, text=True, cwd=directory, env=env)
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1]
+    marks = {}
+    for line in result.stdout.splitlines():
+        name, _, ms = line.rpartition(" ")
+        marks[name] = float(ms)
+    return marks, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-import-ms", type=float, help="fail if the import total exceeds this")
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    top = import_times()
+    total = sum(ms for ms, _ in top)
+    print(f"imports at startup: {total:.0f} ms")
+    for ms, name in sorted(top, reverse=True)[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+    heavy = [name for _, name in top if name.split(".")[0] in ("matplotlib", "PIL")]
+    print(f"matplotlib/PIL loaded at startup: {', '.join(heavy) or 'none'}")
+
+    marks, error = first_paint()
+    if marks is None:
+        print(f"time to first paint: skipped ({error})")
+    else:
+        for name, ms in marks.items():
+            print(f"time to {name}: {ms:.0f} ms")
+
+    if args.max_import_ms is not None and total > args.max_import_ms:
+        sys.exit(f"import time {total:.0f} ms is over the {args.max_import_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Local stand-in for the OpenWeatherMap endpoints used by weather-app.py.
+
+Serves synthetic /data/2.5/weather, /data/2.5/forecast, /data/2.5/group and
+/img/wn/<code>@2x.png responses with an optional artificial delay, and counts
+the requests it receives. Responses carry an ETag and a matching
+If-None-Match gets a 304. Used by the weather benchmarks:
+
+    with StubServer(delay=0.2) as stub:
+        requests.get(f"{stub.api_url}/weather", params={"q": "Nairobi"})
+"""
+import hashlib
+import json
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from weather_fetch import TIMEOUT
+
+CONDITIONS = [
+    (800, "Clear", "clear sky", "01"),
+    (801, "Clouds", "few clouds", "02"),
+    (803, "Clouds", "broken clouds", "04"),
+    (500, "Rain", "light rain", "10"),
+    (211, "Thunderstorm", "thunderstorm", "11"),
+]
+
+
+def fetch_json(url, params=None, timeout=TIMEOUT):
+    # The app's old client: a new connection per request, no pooling or
+    # retries. Kept as the baseline the benchmarks compare against.
+    response = requests.get(url, params=params, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_bytes(url, timeout=TIMEOUT):
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def tiny_png(width=4, height=4):
+    raw = b"".join(b"\x00" + b"\x80\x80\xff\xff" * width for _ in range(height))
+
+    def chunk(kind, data):
+        return struct.pack("!I", len(data)) + kind + data + struct.pack("!I", zlib.crc32(kind + data))
+
+    header = struct.pack("!IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+
+def city_id(name):
+    return zlib.crc32(name.lower().encode("utf-8")) % 9_000_000 + 1_000_000
+
+
+def current_payload(name, units="metric", now=None):
+    now = int(now or time.time()) // 600 * 600  # observations change every 10 minutes
+    cid = city_id(name)
+    code, main, description, icon = CONDITIONS[cid % len(CONDITIONS)]
+    temp = 10 + cid % 20
+    if units == "imperial":
+        temp = temp * 9 / 5 + 32
+    return {
+        "id": cid,
+        "name": name.title(),
+        "dt": now,
+        "sys": {"country": "KE"},
+        "main": {"temp": temp, "feels_like": temp - 1, "humidity": 60, "pressure": 1012},
+        "wind": {"speed": 3.5},
+        "weather": [{"id": code, "main": main, "description": description, "icon": f"{icon}d"}],
+        "visibility": 10000,
+    }
+
+
+def forecast_payload(name, units="metric", points=40, now=None):
+    start = (int(now or time.time()) // 10800 + 1) * 10800
+    cid = city_id(name)
+    entries = []
+    for i in range(points):
+        dt = start + i * 10800
+        code, main, description, icon = CONDITIONS[(cid + i // 3) % len(CONDITIONS)]
+        temp = 12 + (i % 8) * 1.5 + cid % 5
+        if units == "imperial":
+            temp = temp * 9 / 5 + 32
+        entries.append({
+            "dt": dt,
+            "dt_txt": datetime.fromtimestamp(dt, timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+            "main": {"temp": temp, "temp_min": temp - 1, "temp_max": temp + 1},
+            "weather": [{"id": code, "main": main, "description": description, "icon": f"{icon}d"}],
+        })
+    return {"cnt": points, "list": entries, "city": {"id": cid, "name": name.title(), "country": "KE"}}
+
+
+class StubServer:
+    def __init__(self, delay=0.0, host="127.0.0.1", port=0, forecast_points=40):
+        self.delay = delay
+        self.forecast_points = forecast_points
+        self.requests = 0
+        self.not_modified = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+        self.names = {}  # city id -> name, filled as names are looked up
+        self.httpd = ThreadingHTTPServer((host, port), self.make_handler())
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://{host}:{self.httpd.server_address[1]}"
+        self.api_url = f"{self.base_url}/data/2.5"
+        self.icon_url = f"{self.base_url}/img/wn"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def count(self):
+        with self.lock:
+            self.requests += 1
+
+    def make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients can reuse sockets
+
+            def setup(self):
+                super().setup()
+                with stub.lock:
+                    stub.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub.count()
+                if stub.delay:
+                    time.sleep(stub.delay)
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                units = query.get("units", "metric")
+                if url.path.endswith("/weather"):
+                    name = query.get("q", "London")
+                    stub.names[city_id(name)] = name
+                    self.send_json(current_payload(name, units))
+                elif url.path.endswith("/forecast"):
+                    self.send_json(forecast_payload(query.get("q", "London"), units, stub.forecast_points))
+                elif url.path.endswith("/group"):
+                    ids = [int(i) for i in query.get("id", "").split(",") if i]
+                    if len(ids) > 20:
+                        self.send_error(400, "Too many ids")
+                        return
+                    items = [current_payload(stub.names.get(i, f"city{i}"), units) for i in ids]
+                    for item, i in zip(items, ids):
+                        item["id"] = i
+                    self.send_json({"cnt": len(items), "list": items})
+                elif url.path.startswith("/img/wn/"):
+                    self.send_body(tiny_png(), "image/png")
+                else:
+                    self.send_error(404)
+
+            def send_json(self, payload):
+                self.send_body(json.dumps(payload).encode("utf-8"), "application/json")
+
+            def send_body(self, body, content_type):
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+                if self.headers.get("If-None-Match") == etag:
+                    with stub.lock:
+                        stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
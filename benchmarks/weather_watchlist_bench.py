@@ -0,0 +1,61 @@
+"""Requests and wall time to refresh a watchlist of cities.
+
+Run from the repository root:
+
+    python -m benchmarks.weather_watchlist_bench --cities 100 --delay 0.05
+
+Against the local stub server, compares one /weather call per city (what N
+app instances amount to) with Watchlist.fetch_all, both on a cold id cache
+(every name resolved once) and a warm one (group endpoint only).
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.weather_stub import StubServer, fetch_json
+from weather_provider import WeatherProvider
+from weather_watchlist import CityIds, Watchlist
+
+
+def per_city(stub, names):
+    for name in names:
+        fetch_json(f"{stub.api_url}/weather", {"q": name, "appid": "x", "units": "metric"})
+    return len(names)
+
+
+def run(stub, label, func):
+    before = stub.requests
+    started = time.perf_counter()
+    updated = func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:22} {stub.requests - before:>9} {elapsed * 1000:>9.0f} {updated:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.05, help="seconds added to every stub response")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    names = [f"Site {i}" for i in range(args.cities)]
+    with StubServer(delay=args.delay) as stub, tempfile.TemporaryDirectory() as directory:
+        ids = CityIds(os.path.join(directory, "ids.json"))
+        watchlist = Watchlist(WeatherProvider("x", api_url=stub.api_url), ids, max_workers=args.workers)
+
+        def batched():
+            results, errors = watchlist.fetch_all(names)
+            assert not errors, errors
+            return len(results)
+
+        print(f"{args.cities} cities, stub delay {args.delay * 1000:.0f} ms, {args.workers} workers")
+        print(f"{'':22} {'requests':>9} {'wall ms':>9} {'updated':>8}")
+        run(stub, "one call per city", lambda: per_city(stub, names))
+        run(stub, "watchlist, cold ids", batched)
+        run(stub, "watchlist, warm ids", batched)
+        watchlist.shutdown()
+
+
+if __name__ == "__main__":
+    main()
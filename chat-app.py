@@ -1,18 +1,26 @@
 # gui_client.py
-import socket
-import threading
 import tkinter as tk
-from tkinter import scrolledtext, simpledialog
+from collections import deque
+from tkinter import messagebox, scrolledtext, simpledialog
+
+from chat_client import HOST, PORT, ChatClient, ClientThread
+from chat_transcript import Transcript, default_transcript_dir
+
+DRAIN_INTERVAL_MS = 50  # how often queued messages are rendered
+MAX_LINES = 5000  # transcript lines kept in the widget
+PAGE_LINES = 500  # lines loaded from disk when scrolling past either end
 
 
 class ChatGUI:
-    def __init__(self):
+    def __init__(self, nickname=None, host=HOST, port=PORT, transcript_dir=None):
         self.root = tk.Tk()
         self.root.title("Chat Application")
 
         self.chat_area = scrolledtext.ScrolledText(self.root, wrap=tk.WORD)
         self.chat_area.pack(padx=20, pady=5, fill=tk.BOTH, expand=True)
-        self.chat_area.config(state=tk.DISABLED)
+        self.chat_area.config(state=tk.DISABLED, yscrollcommand=self.on_scroll)
+        self.chat_area.tag_configure("match", background="yellow")
+        self.root.bind("<Control-f>", self.search)
 
         self.msg_entry = tk.Entry(self.root)
         self.msg_entry.pack(padx=20, pady=5, fill=tk.X)
@@ -21,53 +29,178 @@ class ChatGUI:
         self.send_btn = tk.Button(self.root, text="Send", command=self.send_message)
         self.send_btn.pack(padx=20, pady=5)
 
-        self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.nickname = simpledialog.askstring("Nickname", "Choose a nickname:", parent=self.root)
-
-    def connect(self, host='localhost', port=12345):
+        self.client = None  # a ChatClient running on a ClientThread once connected
+        self.runner = None
+        self.outbox = []  # encoded frames waiting for the next flush
+        self.flush_pending = False
+
+        # Filled from any thread, rendered only by the Tk main loop
+        self.inbox = deque()
+        self.root.after(DRAIN_INTERVAL_MS, self.drain_inbox)
+
+        self.host = host
+        self.port = port
+        self.nickname = nickname or simpledialog.askstring("Nickname", "Choose a nickname:", parent=self.root)
+
+        # Every message is kept on disk, one history per server and nickname;
+        # the widget shows transcript lines first_shown..last_shown-1
+        self.transcript = Transcript(transcript_dir or default_transcript_dir(host, port, self.nickname))
+        self.last_shown = len(self.transcript)
+        self.first_shown = self.last_shown
+        self.paging = False
+        self.search_text = None
+        self.search_results = None
+        self.show_range(max(0, self.last_shown - PAGE_LINES), self.last_shown)
+
+    def connect(self):
+        # The connection lives on its own asyncio thread; this class is only the view
+        self.client = ChatClient(self.nickname,
+                                 on_message=lambda msg_type, text: self.display_message(text),
+                                 on_disconnect=lambda error: self.display_message("Disconnected from server"))
+        self.runner = ClientThread(self.client)
         try:
-            self.client_socket.connect((host, port))
-            self.client_socket.send(self.nickname.encode('utf-8'))
-
-            receive_thread = threading.Thread(target=self.receive_messages)
-            receive_thread.daemon = True
-            receive_thread.start()
-
+            self.runner.connect(self.host, self.port)
         except Exception as e:
             self.display_message(f"Connection error: {e}")
 
-    def receive_messages(self):
-        while True:
-            try:
-                message = self.client_socket.recv(1024).decode('utf-8')
-                if message:
-                    self.display_message(message)
-            except:
-                self.display_message("Disconnected from server")
-                break
-
     def send_message(self, event=None):
         message = self.msg_entry.get()
         if message:
-            try:
-                self.client_socket.send(message.encode('utf-8'))
-                self.msg_entry.delete(0, tk.END)
-            except:
-                self.display_message("Error sending message")
+            self.outbox.append(message)
+            self.msg_entry.delete(0, tk.END)
+            # Everything queued before Tk goes idle leaves in a single write
+            if not self.flush_pending:
+                self.flush_pending = True
+                self.root.after_idle(self.flush_outbox)
+
+    def flush_outbox(self):
+        self.flush_pending = False
+        if not self.outbox:
+            return
+        batch = list(self.outbox)
+        self.outbox.clear()
+        try:
+            self.runner.send_many(batch)
+        except Exception:
+            self.display_message("Error sending message")
 
     def display_message(self, message):
+        # Safe to call from any thread; deque.append is atomic
+        self.inbox.append(message)
+
+    def drain_inbox(self):
+        pending = len(self.inbox)
+        if pending:
+            batch = [self.inbox.popleft() for _ in range(pending)]
+            following = self.last_shown == len(self.transcript)
+            self.transcript.extend(batch)
+            self.transcript.flush()
+            # While the user is reading older history, new lines only go to disk
+            if following and len(batch) >= MAX_LINES:
+                # Anything older than the last MAX_LINES would be trimmed right away
+                total = len(self.transcript)
+                self.show_range(total - MAX_LINES, total)
+                self.chat_area.see(tk.END)
+            elif following:
+                self.render_batch(batch)
+        self.root.after(DRAIN_INTERVAL_MS, self.drain_inbox)
+
+    def line_count(self):
+        # The text always ends with an empty line after the last newline
+        return int(self.chat_area.index("end-1c").split(".")[0]) - 1
+
+    def render_batch(self, batch):
         self.chat_area.config(state=tk.NORMAL)
-        self.chat_area.insert(tk.END, message + "\n")
+        self.chat_area.insert(tk.END, "\n".join(batch) + "\n")
+        self.last_shown += len(batch)
+        excess = self.line_count() - MAX_LINES
+        if excess > 0:
+            self.chat_area.delete("1.0", f"{excess + 1}.0")
+            self.first_shown += excess
         self.chat_area.config(state=tk.DISABLED)
         self.chat_area.see(tk.END)
 
+    def show_range(self, start, stop):
+        # Replace the widget contents with transcript lines start..stop-1
+        lines = self.transcript.read(start, stop)
+        self.chat_area.config(state=tk.NORMAL)
+        self.chat_area.delete("1.0", tk.END)
+        if lines:
+            self.chat_area.insert(tk.END, "\n".join(lines) + "\n")
+        self.chat_area.config(state=tk.DISABLED)
+        self.first_shown, self.last_shown = start, start + len(lines)
+
+    def on_scroll(self, first, last):
+        self.chat_area.vbar.set(first, last)
+        if self.paging:
+            return
+        if float(first) <= 0.0 and self.first_shown > 0:
+            self.paging = True
+            self.root.after_idle(self.load_older)
+        elif float(last) >= 1.0 and self.last_shown < len(self.transcript):
+            self.paging = True
+            self.root.after_idle(self.load_newer)
+
+    def load_older(self):
+        start = max(0, self.first_shown - PAGE_LINES)
+        lines = self.transcript.read(start, self.first_shown)
+        self.chat_area.config(state=tk.NORMAL)
+        self.chat_area.insert("1.0", "\n".join(lines) + "\n")
+        self.first_shown = start
+        excess = self.line_count() - MAX_LINES
+        if excess > 0:
+            self.chat_area.delete(f"{MAX_LINES + 1}.0", tk.END)
+            self.last_shown -= excess
+        self.chat_area.config(state=tk.DISABLED)
+        # Keep the line the user was looking at in place
+        self.chat_area.yview(f"{len(lines) + 1}.0")
+        self.paging = False
+
+    def load_newer(self):
+        lines = self.transcript.read(self.last_shown, self.last_shown + PAGE_LINES)
+        self.chat_area.config(state=tk.NORMAL)
+        self.chat_area.insert(tk.END, "\n".join(lines) + "\n")
+        self.last_shown += len(lines)
+        bottom = self.line_count() - len(lines)
+        excess = self.line_count() - MAX_LINES
+        if excess > 0:
+            self.chat_area.delete("1.0", f"{excess + 1}.0")
+            self.first_shown += excess
+            bottom -= excess
+        self.chat_area.config(state=tk.DISABLED)
+        self.chat_area.see(f"{max(1, bottom)}.0")
+        self.paging = False
+
+    def search(self, event=None):
+        # Ctrl+F searches the whole transcript newest first; the same text again finds the next older match
+        text = simpledialog.askstring("Search", "Find in transcript:", initialvalue=self.search_text or "",
+                                      parent=self.root)
+        if not text:
+            return
+        if text != self.search_text:
+            self.search_text = text
+            self.search_results = self.transcript.search(text)
+        match = next(self.search_results, None)
+        if match is None:
+            self.search_text = None
+            messagebox.showinfo("Search", f"No more matches for {text!r}", parent=self.root)
+            return
+        index, _ = match
+        self.show_range(max(0, index - PAGE_LINES // 2), index + PAGE_LINES // 2)
+        line = f"{index - self.first_shown + 1}.0"
+        self.chat_area.tag_remove("match", "1.0", tk.END)
+        self.chat_area.tag_add("match", line, f"{line} lineend")
+        self.chat_area.see(line)
+
     def run(self):
         self.connect()
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.root.mainloop()
 
     def on_closing(self):
-        self.client_socket.close()
+        if self.runner is not None:
+            self.runner.close()
+        self.transcript.close()
         self.root.destroy()
 
 
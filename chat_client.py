@@ -0,0 +1,113 @@
+# chat_client.py
+# The client side of the chat protocol without any GUI: connect, send the
+# nickname, write framed messages and hand every received frame to a
+# callback. ChatClient is plain asyncio, so thousands of them can share one
+# event loop for load testing; ClientThread runs one on a background loop
+# for blocking callers such as the Tk interface in chat-app.py.
+import asyncio
+import threading
+
+from chat_protocol import MESSAGE, NICK, FrameDecoder, ProtocolError, encode_frame
+
+HOST = 'localhost'
+PORT = 12345
+RECV_BUFFER_SIZE = 65536
+CONNECT_TIMEOUT = 10
+
+
+class ChatClient:
+    """One chat connection.
+
+    on_message(msg_type, text) is called for every frame from the server and
+    on_disconnect(error) once when the connection ends (error is None for a
+    clean close). Both run on the client's event loop.
+    """
+
+    def __init__(self, nickname, on_message=None, on_disconnect=None):
+        self.nickname = nickname
+        self.on_message = on_message or (lambda msg_type, text: None)
+        self.on_disconnect = on_disconnect or (lambda error: None)
+        self.reader = None
+        self.writer = None
+        self.receive_task = None
+        self.joined = None  # set once the server has sent anything, i.e. accepted the nickname
+        self.received = 0
+
+    @property
+    def connected(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def connect(self, host=HOST, port=PORT):
+        self.joined = asyncio.Event()
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(encode_frame(NICK, self.nickname))
+        self.receive_task = asyncio.create_task(self.receive_loop())
+
+    async def receive_loop(self):
+        decoder = FrameDecoder()
+        error = None
+        try:
+            while True:
+                data = await self.reader.read(RECV_BUFFER_SIZE)
+                if not data:
+                    break
+                frames = decoder.feed(data)
+                self.received += len(frames)
+                self.joined.set()
+                for msg_type, text in frames:
+                    self.on_message(msg_type, text)
+        except (ConnectionError, ProtocolError) as e:
+            error = e
+        finally:
+            self.writer.transport.abort()
+        self.on_disconnect(error)
+
+    def send(self, text):
+        self.send_many((text,))
+
+    def send_many(self, texts):
+        # One write for the whole batch; the transport buffers it without blocking
+        if not self.connected:
+            raise ConnectionError("not connected")
+        self.writer.write(b"".join(encode_frame(MESSAGE, text) for text in texts))
+
+    async def drain(self):
+        await self.writer.drain()
+
+    async def close(self):
+        if self.writer is None:
+            return
+        self.writer.close()
+        if self.receive_task is not None:
+            try:
+                await self.receive_task
+            except asyncio.CancelledError:
+                pass
+
+
+class ClientThread:
+    """Runs a ChatClient on its own event loop thread; every method is safe to call from any thread."""
+
+    def __init__(self, client):
+        self.client = client
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="chat-client", daemon=True)
+        self.thread.start()
+
+    def run(self, coro, timeout=CONNECT_TIMEOUT):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def connect(self, host=HOST, port=PORT):
+        self.run(self.client.connect(host, port))
+
+    def send_many(self, texts):
+        return self.run(self._send_many(list(texts)))
+
+    async def _send_many(self, texts):
+        self.client.send_many(texts)
+
+    def close(self):
+        try:
+            self.run(self.client.close())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
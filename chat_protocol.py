@@ -0,0 +1,67 @@
+# chat_protocol.py
+# Wire format shared by chat-app.py and chat_server.py:
+#
+#   +----------------+--------+-------------------+
+#   | length (u32 BE)| type u8| payload (UTF-8)   |
+#   +----------------+--------+-------------------+
+#
+# length counts the payload bytes only.
+import struct
+
+HEADER = struct.Struct("!IB")
+MAX_PAYLOAD = 64 * 1024
+
+# Message types
+NICK = 1      # client -> server, first frame on a connection
+MESSAGE = 2   # chat text, both directions
+NOTICE = 3    # server -> client status lines (joins, leaves, room lists)
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+def encode_frame(msg_type, text):
+    payload = text.encode('utf-8')
+    if len(payload) > MAX_PAYLOAD:
+        raise ProtocolError(f"Payload of {len(payload)} bytes exceeds {MAX_PAYLOAD}")
+    return HEADER.pack(len(payload), msg_type) + payload
+
+
+class FrameDecoder:
+    """Incremental decoder: feed it raw chunks, get back complete frames.
+
+    Bytes are accumulated in a single bytearray and payloads are decoded
+    straight out of a memoryview over it. A frame split across reads, even in
+    the middle of a multi-byte character, is only decoded once it is complete.
+    """
+
+    def __init__(self, max_payload=MAX_PAYLOAD):
+        self.max_payload = max_payload
+        self._buf = bytearray()
+
+    def feed(self, data):
+        """Append a chunk and return a list of (type, text) for every complete frame."""
+        buf = self._buf
+        buf += data
+        frames = []
+        pos = 0
+        size = len(buf)
+        header = HEADER.size
+        with memoryview(buf) as view:
+            while size - pos >= header:
+                length, msg_type = HEADER.unpack_from(buf, pos)
+                if length > self.max_payload:
+                    raise ProtocolError(f"Frame of {length} bytes exceeds {self.max_payload}")
+                end = pos + header + length
+                if end > size:
+                    break
+                frames.append((msg_type, str(view[pos + header:end], 'utf-8', 'replace')))
+                pos = end
+        if pos:
+            # Dropping a prefix of a bytearray just moves its start pointer
+            del buf[:pos]
+        return frames
+
+    def pending(self):
+        return len(self._buf)
@@ -0,0 +1,224 @@
+# chat_server.py
+import argparse
+import asyncio
+
+from chat_protocol import MAX_PAYLOAD, MESSAGE, NICK, NOTICE, FrameDecoder, ProtocolError, encode_frame
+
+HOST = 'localhost'
+PORT = 12345
+DEFAULT_ROOM = "lobby"
+QUEUE_SIZE = 256  # pending payloads per connection before it is considered too slow
+MAX_NAME = 64  # characters in a nickname or room name
+MAX_LISTED_ROOMS = 100  # rooms named in a /rooms reply, the rest are only counted
+
+
+def notice(text):
+    # Notices quote names, so cap them like messages: one that can't fit in a
+    # frame is replaced instead of raising and dropping the connection
+    try:
+        return encode_frame(NOTICE, text)
+    except ProtocolError:
+        return encode_frame(NOTICE, f"Notice not shown: longer than {MAX_PAYLOAD} bytes")
+
+
+class Connection:
+    def __init__(self, server, reader, writer, nickname):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.nickname = nickname
+        self.room = None
+        self.queue = asyncio.Queue(maxsize=server.queue_size)
+        self.closed = False
+
+    def deliver(self, payload):
+        # Never block the sender: a full queue means this reader can't keep up,
+        # so it gets dropped instead of stalling everyone else in the room.
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.server.slow_disconnects += 1
+            self.close()
+
+    async def write_loop(self):
+        try:
+            while True:
+                payload = await self.queue.get()
+                self.writer.write(payload)
+                # Flush everything queued meanwhile before waiting on the socket
+                while not self.queue.empty():
+                    self.writer.write(self.queue.get_nowait())
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.writer.transport.abort()
+
+
+class Room:
+    def __init__(self, name):
+        self.name = name
+        self.members = set()
+
+    def broadcast(self, payload):
+        # Copy: deliver() can close a member, which removes it from the room
+        for member in list(self.members):
+            member.deliver(payload)
+
+
+class ChatServer:
+    def __init__(self, host=HOST, port=PORT, queue_size=QUEUE_SIZE):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.rooms = {}
+        self.connections = set()
+        self.handlers = {}  # handler task -> writer
+        self.messages_in = 0
+        self.slow_disconnects = 0
+        self.server = None
+
+    def get_room(self, name):
+        room = self.rooms.get(name)
+        if room is None:
+            room = self.rooms[name] = Room(name)
+        return room
+
+    def join(self, conn, name):
+        if conn.room is not None:
+            self.leave(conn)
+        room = self.get_room(name)
+        room.members.add(conn)
+        conn.room = room
+        conn.deliver(notice(f"Connected to {room.name} as {conn.nickname}"))
+        room.broadcast(notice(f"{conn.nickname} joined {room.name}!"))
+
+    def leave(self, conn):
+        room = conn.room
+        if room is None:
+            return
+        room.members.discard(conn)
+        conn.room = None
+        if room.members:
+            room.broadcast(notice(f"{conn.nickname} left {room.name}."))
+        elif room.name != DEFAULT_ROOM:
+            del self.rooms[room.name]
+
+    def handle_message(self, conn, message):
+        if message.startswith("/join "):
+            name = message[6:].strip()
+            if len(name) > MAX_NAME:
+                conn.deliver(notice(f"Room names are limited to {MAX_NAME} characters"))
+            elif name:
+                self.join(conn, name)
+        elif message.strip() == "/rooms":
+            rooms = list(self.rooms.values())
+            names = ", ".join(f"{r.name} ({len(r.members)})" for r in rooms[:MAX_LISTED_ROOMS])
+            if len(rooms) > MAX_LISTED_ROOMS:
+                names += f" … and {len(rooms) - MAX_LISTED_ROOMS} more"
+            conn.deliver(notice(f"Rooms: {names}"))
+        else:
+            # Encode once, every subscriber shares the same bytes object
+            try:
+                frame = encode_frame(MESSAGE, f"{conn.nickname}: {message}")
+            except ProtocolError:
+                # The nickname prefix pushed a valid frame over the limit: refuse
+                # the message, not the connection
+                conn.deliver(notice(f"Message not sent: longer than {MAX_PAYLOAD} bytes"))
+                return
+            conn.room.broadcast(frame)
+
+    async def handle_client(self, reader, writer):
+        task = asyncio.current_task()
+        self.handlers[task] = writer
+        try:
+            await self.serve_client(reader, writer)
+        finally:
+            del self.handlers[task]
+
+    async def serve_client(self, reader, writer):
+        # The first frame on a connection must carry the nickname
+        decoder = FrameDecoder()
+        frames = []
+        try:
+            while not frames:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                frames = decoder.feed(data)
+        except (ConnectionError, ProtocolError):
+            frames = []
+        if not frames or frames[0][0] != NICK or not frames[0][1].strip():
+            writer.transport.abort()
+            return
+
+        conn = Connection(self, reader, writer, frames[0][1].strip()[:MAX_NAME])
+        self.connections.add(conn)
+        write_task = asyncio.create_task(conn.write_loop())
+        self.join(conn, DEFAULT_ROOM)
+        try:
+            frames = frames[1:]
+            while not conn.closed:
+                for msg_type, text in frames:
+                    if msg_type == MESSAGE:
+                        self.messages_in += 1
+                        self.handle_message(conn, text)
+                data = await reader.read(65536)
+                if not data:
+                    break
+                frames = decoder.feed(data)
+        except (ConnectionError, ProtocolError):
+            pass
+        finally:
+            self.connections.discard(conn)
+            self.leave(conn)
+            write_task.cancel()
+            conn.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(
+            self.handle_client, self.host, self.port, backlog=4096
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        # Aborting the transports lets every handler run its cleanup and return
+        for writer in self.handlers.values():
+            writer.transport.abort()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Chat server listening on {self.host}:{self.port}")
+        async with self.server:
+            await self.server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-room chat server for chat-app.py")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    args = parser.parse_args()
+
+    server = ChatServer(args.host, args.port, args.queue_size)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("👋 Server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# chat_transcript.py
+# Local, append-only record of every chat message ChatGUI has seen, so the
+# history survives reconnects without living in the Tk text widget. Messages
+# go into numbered segment files (one message per line) of SEGMENT_LINES
+# each; a matching .idx file holds the byte offset of every line as 8-byte
+# integers. Any page of history is one seek into the index and one into the
+# log, and search streams the segments instead of loading them. Each server
+# and nickname gets its own directory (see default_transcript_dir), since a
+# transcript must only ever have one writer.
+import os
+import struct
+import threading
+from array import array
+from urllib.parse import quote
+
+TRANSCRIPT_DIR = "chat_transcript"
+SEGMENT_LINES = 65536
+OFFSET = struct.Struct("<Q")
+
+
+def default_transcript_dir(host, port, nickname, root=TRANSCRIPT_DIR):
+    """The default directory for one server and nickname's history."""
+    return os.path.join(root, quote(f"{host}_{port}_{nickname}", safe=""))
+
+
+class Transcript:
+    def __init__(self, directory=TRANSCRIPT_DIR, segment_lines=SEGMENT_LINES):
+        self.directory = directory
+        self.segment_lines = segment_lines
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        segments = sorted(int(name[:-4]) for name in os.listdir(directory) if name.endswith(".log"))
+        self.segment = segments[-1] if segments else 0
+        self.offsets = self.recover(self.segment)  # offsets of the lines in the open segment
+        self.log = open(self.path(self.segment, "log"), "ab")
+        self.index = open(self.path(self.segment, "idx"), "ab")
+        self.size = self.log.tell()
+
+    def path(self, segment, kind):
+        return os.path.join(self.directory, f"{segment:08d}.{kind}")
+
+    def recover(self, segment):
+        """Rebuild the open segment's index from its log, dropping a torn last line."""
+        offsets = array("Q")
+        log_path = self.path(segment, "log")
+        try:
+            with open(log_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        end = data.rfind(b"\n") + 1
+        position = 0
+        while position < end:
+            offsets.append(position)
+            position = data.index(b"\n", position) + 1
+        if end < len(data):
+            with open(log_path, "r+b") as f:
+                f.truncate(end)
+        with open(self.path(segment, "idx"), "wb") as f:
+            offsets.tofile(f)
+        return offsets
+
+    def __len__(self):
+        with self.lock:
+            return self.segment * self.segment_lines + len(self.offsets)
+
+    def extend(self, messages):
+        """Append messages; each is stored on one line, so newlines become spaces."""
+        with self.lock:
+            for message in messages:
+                if len(self.offsets) == self.segment_lines:
+                    self._rotate()
+                line = message.replace("\n", " ").encode("utf-8") + b"\n"
+                self.offsets.append(self.size)
+                self.index.write(OFFSET.pack(self.size))
+                self.log.write(line)
+                self.size += len(line)
+
+    def append(self, message):
+        self.extend((message,))
+
+    def _rotate(self):
+        self.log.close()
+        self.index.close()
+        self.segment += 1
+        self.offsets = array("Q")
+        self.log = open(self.path(self.segment, "log"), "ab")
+        self.index = open(self.path(self.segment, "idx"), "ab")
+        self.size = 0
+
+    def flush(self):
+        with self.lock:
+            self.log.flush()
+            self.index.flush()
+
+    def read(self, start, stop):
+        """Messages start..stop-1 (clamped to what exists), oldest first."""
+        with self.lock:
+            self.log.flush()
+            self.index.flush()
+            total = self.segment * self.segment_lines + len(self.offsets)
+            start, stop = max(0, start), min(stop, total)
+            messages = []
+            while start < stop:
+                segment, first = divmod(start, self.segment_lines)
+                count = min(stop - start, self.segment_lines - first)
+                messages.extend(self._read_segment(segment, first, count))
+                start += count
+            return messages
+
+    def _read_segment(self, segment, first, count):
+        if segment == self.segment:
+            begin = self.offsets[first]
+            end = self.offsets[first + count] if first + count < len(self.offsets) else self.size
+        else:
+            with open(self.path(segment, "idx"), "rb") as f:
+                f.seek(first * OFFSET.size)
+                bounds = array("Q")
+                bounds.frombytes(f.read((count + 1) * OFFSET.size))
+            begin = bounds[0]
+            end = bounds[count] if len(bounds) > count else None
+        with open(self.path(segment, "log"), "rb") as f:
+            f.seek(begin)
+            data = f.read() if end is None else f.read(end - begin)
+        return data.decode("utf-8").split("\n")[:count]
+
+    def search(self, text, newest_first=True):
+        """Yield (index, message) for every message containing text, ignoring case.
+
+        Reads one segment at a time, so memory stays flat however long the
+        transcript is. Messages appended after the search starts are not seen.
+        """
+        # Both sides are casefolded as str: bytes.lower() would only fold ASCII
+        needle = text.casefold()
+        with self.lock:
+            self.log.flush()
+            last_segment, last_size = self.segment, self.size
+        segments = range(last_segment, -1, -1) if newest_first else range(last_segment + 1)
+        for segment in segments:
+            limit = last_size if segment == last_segment else None
+            with open(self.path(segment, "log"), "rb") as f:
+                data = f.read() if limit is None else f.read(limit)
+            data = data.decode("utf-8")
+            folded = data.casefold()
+            # Folding never removes characters or newlines: with the length
+            # unchanged the offsets line up, else (ß -> ss) go by line number
+            lines = None if len(folded) == len(data) else data.split("\n")
+            matches = []
+            number = 0  # line number of the line starting at counted
+            counted = 0
+            position = folded.find(needle)
+            while position != -1:
+                start = folded.rfind("\n", 0, position) + 1
+                end = folded.index("\n", position)
+                number += folded.count("\n", counted, start)
+                counted = start
+                line = data[start:end] if lines is None else lines[number]
+                matches.append((segment * self.segment_lines + number, line))
+                position = folded.find(needle, end)
+            yield from reversed(matches) if newest_first else matches
+
+    def close(self):
+        with self.lock:
+            self.log.close()
+            self.index.close()
@@ -0,0 +1,22 @@
+# conftest.py
+# Being at the repository root, this puts the root on sys.path, so plain
+# `pytest` imports the modules under test just like `python -m pytest` does.
+# It also holds the fixtures shared by tests/.
+import os
+
+import pytest
+
+from todo_storage import JournalBackend, JsonBackend, SqliteBackend
+
+TODO_BACKENDS = {
+    "sqlite": lambda d: SqliteBackend(os.path.join(d, "todo.db"), os.path.join(d, "missing.json")),
+    "journal": lambda d: JournalBackend(os.path.join(d, "todo.snapshot.json"), os.path.join(d, "todo.journal"),
+                                        os.path.join(d, "missing.json")),
+    "json": lambda d: JsonBackend(os.path.join(d, "todo.json")),
+}
+
+
+@pytest.fixture
+def todo_backend(tmp_path):
+    """todo_backend(kind="sqlite") opens that backend's files in tmp_path; call it again to reopen them."""
+    return lambda kind="sqlite": TODO_BACKENDS[kind](str(tmp_path))
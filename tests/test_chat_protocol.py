@@ -0,0 +1,78 @@
+import struct
+
+import pytest
+
+from chat_protocol import HEADER, MAX_PAYLOAD, MESSAGE, NICK, NOTICE, FrameDecoder, ProtocolError, encode_frame
+
+
+def test_round_trip():
+    decoder = FrameDecoder()
+    assert decoder.feed(encode_frame(MESSAGE, "hello")) == [(MESSAGE, "hello")]
+    assert decoder.pending() == 0
+
+
+def test_frame_split_across_feeds():
+    frame = encode_frame(MESSAGE, "hello world")
+    decoder = FrameDecoder()
+    assert decoder.feed(frame[:8]) == []
+    assert decoder.pending() == 8
+    assert decoder.feed(frame[8:]) == [(MESSAGE, "hello world")]
+    assert decoder.pending() == 0
+
+
+def test_split_inside_multibyte_character():
+    text = "café \U0001f600"
+    frame = encode_frame(MESSAGE, text)
+    # Cut between the bytes of the 4-byte emoji
+    cut = len(frame) - 2
+    decoder = FrameDecoder()
+    assert decoder.feed(frame[:cut]) == []
+    assert decoder.feed(frame[cut:]) == [(MESSAGE, text)]
+    assert decoder.pending() == 0
+
+
+def test_byte_at_a_time():
+    text = "über 世界"
+    frame = encode_frame(NOTICE, text)
+    decoder = FrameDecoder()
+    frames = []
+    for i in range(len(frame)):
+        frames += decoder.feed(frame[i:i + 1])
+    assert frames == [(NOTICE, text)]
+    assert decoder.pending() == 0
+
+
+def test_several_frames_in_one_chunk():
+    chunk = encode_frame(NICK, "alice") + encode_frame(MESSAGE, "one") + encode_frame(MESSAGE, "")
+    decoder = FrameDecoder()
+    assert decoder.feed(chunk) == [(NICK, "alice"), (MESSAGE, "one"), (MESSAGE, "")]
+    assert decoder.pending() == 0
+
+
+def test_complete_frames_before_a_partial_one():
+    second = encode_frame(MESSAGE, "two")
+    decoder = FrameDecoder()
+    assert decoder.feed(encode_frame(MESSAGE, "one") + second[:5]) == [(MESSAGE, "one")]
+    assert decoder.pending() == 5
+    assert decoder.feed(second[5:]) == [(MESSAGE, "two")]
+    assert decoder.pending() == 0
+
+
+def test_partial_header():
+    frame = encode_frame(MESSAGE, "hi")
+    decoder = FrameDecoder()
+    assert decoder.feed(frame[:HEADER.size - 1]) == []
+    assert decoder.pending() == HEADER.size - 1
+    assert decoder.feed(frame[HEADER.size - 1:]) == [(MESSAGE, "hi")]
+    assert decoder.pending() == 0
+
+
+def test_oversized_length_raises():
+    decoder = FrameDecoder(max_payload=16)
+    with pytest.raises(ProtocolError):
+        decoder.feed(struct.pack("!IB", 17, MESSAGE))
+
+
+def test_encode_rejects_oversized_payload():
+    with pytest.raises(ProtocolError):
+        encode_frame(MESSAGE, "x" * (MAX_PAYLOAD + 1))
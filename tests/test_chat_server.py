@@ -0,0 +1,51 @@
+from chat_protocol import MAX_PAYLOAD, NOTICE, FrameDecoder
+from chat_server import MAX_LISTED_ROOMS, MAX_NAME, ChatServer
+
+
+class FakeConnection:
+    def __init__(self, nickname):
+        self.nickname = nickname
+        self.room = None
+        self.closed = False
+        self.frames = []
+        self.decoder = FrameDecoder()
+
+    def deliver(self, payload):
+        self.frames.extend(self.decoder.feed(payload))
+
+    def last_notice(self):
+        msg_type, text = self.frames[-1]
+        assert msg_type == NOTICE
+        return text
+
+
+def test_rooms_reply_is_cut_short_instead_of_overflowing():
+    server = ChatServer()
+    for i in range(3000):
+        server.join(FakeConnection(f"user{i}"), f"room-{i:04d}-" + "x" * 40)
+    conn = FakeConnection("asker")
+    server.join(conn, "lobby")
+    server.handle_message(conn, "/rooms")
+    text = conn.last_notice()
+    assert text.startswith("Rooms: room-0000-")
+    assert text.endswith(f" … and {3001 - MAX_LISTED_ROOMS} more")
+    assert len(text.encode("utf-8")) <= MAX_PAYLOAD
+
+
+def test_overlong_room_name_is_refused():
+    server = ChatServer()
+    conn = FakeConnection("me")
+    server.join(conn, "lobby")
+    server.handle_message(conn, "/join " + "r" * (MAX_NAME + 1))
+    assert conn.room.name == "lobby"
+    assert conn.last_notice() == f"Room names are limited to {MAX_NAME} characters"
+    server.handle_message(conn, "/join " + "r" * MAX_NAME)
+    assert conn.room.name == "r" * MAX_NAME
+
+
+def test_overlong_message_is_refused_not_fatal():
+    server = ChatServer()
+    conn = FakeConnection("me")
+    server.join(conn, "lobby")
+    server.handle_message(conn, "x" * MAX_PAYLOAD)
+    assert conn.last_notice() == f"Message not sent: longer than {MAX_PAYLOAD} bytes"
@@ -0,0 +1,17 @@
+from chat_transcript import Transcript
+
+
+def test_search_ignores_non_ascii_case(tmp_path):
+    transcript = Transcript(str(tmp_path), segment_lines=3)
+    transcript.extend(["Émile: salut", "bob: hi", "ÉMILE: ça va", "Straße 1", "nothing", "émile: oui"])
+    assert list(transcript.search("Émile")) == [(5, "émile: oui"), (2, "ÉMILE: ça va"), (0, "Émile: salut")]
+    assert list(transcript.search("émile", newest_first=False))[0] == (0, "Émile: salut")
+    transcript.close()
+
+
+def test_search_finds_lines_after_folding_changes_lengths(tmp_path):
+    transcript = Transcript(str(tmp_path))
+    transcript.extend(["Straße 1", "alice: hello", "STRASSE 2", "alice: bye"])
+    assert list(transcript.search("strasse", newest_first=False)) == [(0, "Straße 1"), (2, "STRASSE 2")]
+    assert list(transcript.search("ALICE", newest_first=False)) == [(1, "alice: hello"), (3, "alice: bye")]
+    transcript.close()
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+import pytest
+
+import todo
+
+
+@pytest.mark.parametrize("typed, end_of_day, expected", [
+    ("2025-06-01", False, datetime(2025, 6, 1, 0, 0)),
+    ("2025-06-01", True, datetime(2025, 6, 1, 23, 59)),
+    ("2025-06-01 00:00", True, datetime(2025, 6, 1, 0, 0)),
+    ("2025-06-01 12:30", True, datetime(2025, 6, 1, 12, 30)),
+    ("june", True, None),
+])
+def test_ask_date_only_stretches_a_bare_date(monkeypatch, typed, end_of_day, expected):
+    monkeypatch.setattr("builtins.input", lambda prompt: typed)
+    assert todo.ask_date("Due until: ", end_of_day) == expected
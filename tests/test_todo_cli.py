@@ -0,0 +1,51 @@
+import gc
+import io
+from datetime import datetime
+
+import pytest
+
+import todo_cli
+from todo_store import TaskStore
+
+
+def test_bare_due_to_date_covers_the_whole_day():
+    args = todo_cli.build_parser().parse_args(["export", "--due-from", "2025-06-01", "--due-to", "2025-06-01"])
+    query = todo_cli.query_from_args(args)
+    assert query.due_from == datetime(2025, 6, 1, 0, 0)
+    assert query.due_to == datetime(2025, 6, 1, 23, 59)
+    assert todo_cli.parse_due("2025-06-01 12:30", end_of_day=True) == datetime(2025, 6, 1, 12, 30)
+
+
+def test_bad_ndjson_line_is_reported_past_blank_lines():
+    f = io.StringIO('{"task": "a"}\n\n\n{"task": \n{"task": "b"}\n')
+    with pytest.raises(ValueError, match="^line 4:"):
+        list(todo_cli.read_records(f, "ndjson", chunk_lines=10))
+
+
+def test_import_continues_ids_without_loading_tasks(todo_backend, tmp_path, monkeypatch):
+    store = TaskStore(todo_backend())
+    store.load()
+    store.add("first")
+    store.delete(store.add("second").id)
+    store.backend.close()
+
+    path = tmp_path / "tasks.ndjson"
+    path.write_text('{"task": "c"}\n{"task": "d"}\n', encoding="utf-8")
+    store = TaskStore(todo_backend())
+    monkeypatch.setattr(store.backend, "load", lambda: pytest.fail("import loaded every task"))
+    assert todo_cli.main(["import", str(path)], store) == 0
+
+    store = TaskStore(todo_backend())
+    assert [(t.id, t.task) for t in store.load()] == [(1, "first"), (3, "c"), (4, "d")]
+    store.backend.close()
+
+
+def test_import_turns_the_collector_back_on_after_an_error(todo_backend):
+    store = TaskStore(todo_backend())
+    store.load()
+    with pytest.raises(ValueError):
+        todo_cli.import_tasks(store, io.StringIO('{"task": "a"}\n{"state": "Done"}\n'))
+    assert gc.isenabled()
+    assert todo_cli.import_tasks(store, io.StringIO('{"task": "b"}\n')) == 1
+    assert gc.isenabled()
+    store.backend.close()
@@ -0,0 +1,144 @@
+import random
+from datetime import datetime, timedelta
+
+from todo_scheduler import DUE, WARNING, ReminderScheduler
+from todo_store import Task
+
+START = datetime(2025, 1, 1, 9, 0)
+
+
+class FakeClock:
+    def __init__(self, now=START):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, **kwargs):
+        self.now += timedelta(**kwargs)
+
+
+def make_scheduler():
+    clock = FakeClock()
+    fired = []
+    scheduler = ReminderScheduler(on_warning=lambda t: fired.append((WARNING, t.id)),
+                                  on_due=lambda t: fired.append((DUE, t.id)),
+                                  clock=clock)
+    return scheduler, clock, fired
+
+
+def assert_stale_matches(scheduler):
+    live = sum(1 for e in scheduler.heap if scheduler._is_live(e))
+    assert scheduler.stale == len(scheduler.heap) - live
+
+
+def test_warning_then_due():
+    scheduler, clock, fired = make_scheduler()
+    scheduler.update(Task(1, "call", START + timedelta(minutes=10)))
+
+    scheduler.run_pending()
+    assert fired == []
+    clock.advance(minutes=5)
+    scheduler.run_pending()
+    assert fired == [(WARNING, 1)]
+    clock.advance(minutes=5)
+    scheduler.run_pending()
+    assert fired == [(WARNING, 1), (DUE, 1)]
+    clock.advance(hours=1)
+    scheduler.run_pending()
+    assert fired == [(WARNING, 1), (DUE, 1)]
+    assert scheduler.next_deadline() is None
+    assert_stale_matches(scheduler)
+
+
+def test_already_due_task_skips_the_warning():
+    scheduler, clock, fired = make_scheduler()
+    scheduler.update(Task(1, "late", START - timedelta(minutes=1)))
+    scheduler.run_pending()
+    assert fired == [(DUE, 1)]
+
+
+def test_update_reschedules():
+    scheduler, clock, fired = make_scheduler()
+    task = Task(1, "call", START + timedelta(minutes=10))
+    scheduler.update(task)
+    task.time = START + timedelta(hours=1)
+    scheduler.update(task)
+
+    clock.advance(minutes=10)
+    scheduler.run_pending()
+    assert fired == []
+    assert scheduler.next_deadline() == task.time - timedelta(minutes=5)
+    clock.advance(minutes=45)
+    scheduler.run_pending()
+    assert fired == [(WARNING, 1)]
+    clock.advance(minutes=5)
+    scheduler.run_pending()
+    assert fired == [(WARNING, 1), (DUE, 1)]
+    assert_stale_matches(scheduler)
+
+
+def test_remove_cancels_both_entries():
+    scheduler, clock, fired = make_scheduler()
+    task = Task(1, "call", START + timedelta(minutes=10))
+    scheduler.update(task)
+    scheduler.remove(task)
+    assert_stale_matches(scheduler)
+
+    clock.advance(hours=1)
+    scheduler.run_pending()
+    assert fired == []
+    assert scheduler.heap == []
+    assert scheduler.stale == 0
+
+
+def test_mark_done_cancels_both_entries():
+    scheduler, clock, fired = make_scheduler()
+    task = Task(1, "call", START + timedelta(minutes=10))
+    scheduler.update(task)
+    task.state = "Done"
+    scheduler.update(task)
+
+    clock.advance(hours=1)
+    scheduler.run_pending()
+    assert fired == []
+    assert scheduler.next_deadline() is None
+
+
+def test_remove_after_warning_counts_one_stale_entry():
+    scheduler, clock, fired = make_scheduler()
+    task = Task(1, "call", START + timedelta(minutes=10))
+    scheduler.update(task)
+    clock.advance(minutes=5)
+    scheduler.run_pending()
+    assert fired == [(WARNING, 1)]
+
+    scheduler.remove(task)
+    assert len(scheduler.heap) == 1
+    assert scheduler.stale == 1
+    assert scheduler.next_deadline() is None
+    assert scheduler.heap == []
+    assert scheduler.stale == 0
+
+
+def test_update_many_fires_in_time_order():
+    scheduler, clock, fired = make_scheduler()
+    rng = random.Random(1)
+    tasks = [Task(i, f"task {i}", START + timedelta(minutes=rng.randrange(10, 1000))) for i in range(200)]
+    tasks.append(Task(200, "no time"))
+    tasks.append(Task(201, "done", START + timedelta(minutes=20), "Done"))
+    scheduler.update_many(tasks)
+    assert len(scheduler.heap) == 400
+    assert all(scheduler.heap[(i - 1) // 2] <= scheduler.heap[i] for i in range(1, len(scheduler.heap)))
+
+    # A second bulk load replaces the first schedule instead of doubling it
+    scheduler.update_many(tasks)
+    assert_stale_matches(scheduler)
+
+    clock.advance(days=1)
+    scheduler.run_pending()
+    due = [task_id for kind, task_id in fired if kind == DUE]
+    expected = sorted((t for t in tasks if t.time and t.state == "Pending"), key=lambda t: (t.time, t.id))
+    assert due == [t.id for t in expected]
+    assert scheduler.next_deadline() is None
+    assert scheduler.stale == 0
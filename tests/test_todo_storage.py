@@ -0,0 +1,83 @@
+import json
+import threading
+
+import pytest
+
+from todo_store import Task, TaskStore
+
+
+def reopen(todo_backend, kind, store=None):
+    if store is not None:
+        store.save()
+        store.backend.close()
+    store = TaskStore(todo_backend(kind))
+    store.load()
+    return store
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "journal", "json"])
+def test_ids_survive_a_restart(kind, todo_backend):
+    store = reopen(todo_backend, kind)
+    for text in ("one", "two", "three"):
+        store.add(text)
+    store.delete(1)
+
+    store = reopen(todo_backend, kind, store)
+    assert [(t.id, t.task) for t in store.all()] == [(2, "two"), (3, "three")]
+    store.backend.close()
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "journal"])
+def test_deleted_highest_id_is_not_reused(kind, todo_backend):
+    store = reopen(todo_backend, kind)
+    for text in ("one", "two", "three"):
+        store.add(text)
+    store.delete(3)
+
+    store = reopen(todo_backend, kind, store)
+    assert store.add("four").id == 4
+    store = reopen(todo_backend, kind, store)
+    assert [t.id for t in store.all()] == [1, 2, 4]
+    store.backend.close()
+
+
+def test_sqlite_next_id_without_loading(todo_backend):
+    store = reopen(todo_backend, "sqlite")
+    for text in ("one", "two", "three"):
+        store.add(text)
+    store.delete(3)
+    store.backend.close()
+    assert todo_backend().load_next_id() == 4
+
+
+def test_json_without_ids_is_numbered_by_position(todo_backend, tmp_path):
+    with open(tmp_path / "todo.json", "w") as f:
+        json.dump([{"task": "a", "time": None, "state": "Pending"},
+                   {"task": "b", "time": "2025-01-01 10:00", "state": "Done"}], f)
+    store = reopen(todo_backend, "json")
+    assert [(t.id, t.task) for t in store.all()] == [(1, "a"), (2, "b")]
+    assert store.add("c").id == 3
+
+
+def test_json_saves_from_two_threads(todo_backend, tmp_path):
+    store = reopen(todo_backend, "json")
+    store.add_many([Task(None, f"task {i}") for i in range(2000)])
+    errors = []
+
+    def mark(ids, state):
+        try:
+            for task_id in ids:
+                store.set_state(task_id, state)
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=mark, args=(range(1, 41), "Overdue")),
+               threading.Thread(target=mark, args=(range(41, 81), "Done"))]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert errors == []
+    store = reopen(todo_backend, "json", store)
+    assert store.count("Overdue") == 40 and store.count("Done") == 40
+    assert not list(tmp_path.glob("*.tmp"))
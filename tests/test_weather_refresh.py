@@ -0,0 +1,47 @@
+import random
+
+from weather_refresh import BACKOFF_BASE, RefreshScheduler
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def make_scheduler(interval=3 * 60 * 60):
+    clock = FakeClock()
+    scheduler = RefreshScheduler(interval=interval, jitter=0, clock=clock, rng=random.Random(1))
+    runs = []
+    scheduler.add("city", lambda: runs.append(clock()), lambda result: None, lambda error, retry_in: None)
+    return scheduler, clock, runs
+
+
+def test_retry_runs_the_job_after_the_backoff_instead_of_the_next_slot():
+    scheduler, clock, runs = make_scheduler()
+    retry_in = scheduler.retry("city")
+    assert BACKOFF_BASE / 2 <= retry_in <= BACKOFF_BASE
+    clock.advance(retry_in - 1)
+    scheduler.run_pending()
+    assert runs == []
+    clock.advance(1)
+    scheduler.run_pending()
+    assert runs == [retry_in]
+    # Success resets the backoff and goes back to the regular slots
+    assert scheduler.jobs["city"].failures == 0
+    assert scheduler.next_deadline() == 3 * 60 * 60
+
+
+def test_repeated_retries_back_off():
+    scheduler, clock, runs = make_scheduler()
+    first = scheduler.retry("city")
+    second = scheduler.retry("city")
+    assert second > first
+    # The earlier retry still stands
+    assert scheduler.next_deadline() == first
+    assert scheduler.retry("missing") is None
@@ -1,58 +1,84 @@
-import json
-import time
+import sys
 import threading
-from datetime import datetime, timedelta
+from datetime import datetime
 
-todo = []  # list of dicts: {"task": str, "time": datetime, "state": str}
+import todo_cli
+from todo_query import Query, pages
+from todo_scheduler import ReminderScheduler
+from todo_storage import open_backend
+from todo_store import TaskStore
+
+store = None  # TaskStore holding todo_store.Task records, see todo_store.py
+PAGE_SIZE = 20  # tasks printed before asking whether to continue
 
 
 # ---------------------- Persistence ----------------------
 
 def save_tasks():
-    with open("todo.json", "w") as f:
-        json.dump(
-            [
-                {
-                    "task": t["task"],
-                    "time": t["time"].strftime("%Y-%m-%d %H:%M") if t["time"] else None,
-                    "state": t["state"],
-                }
-                for t in todo
-            ],
-            f,
-            indent=4,
-        )
+    store.save()
 
 
 def load_tasks():
-    global todo
-    try:
-        with open("todo.json", "r") as f:
-            data = json.load(f)
-            todo = [
-                {
-                    "task": d["task"],
-                    "time": datetime.strptime(d["time"], "%Y-%m-%d %H:%M") if d["time"] else None,
-                    "state": d["state"],
-                }
-                for d in data
-            ]
-    except FileNotFoundError:
-        todo = []
+    global store
+    store = TaskStore(open_backend())
+    scheduler.update_many(store.load())
 
 
 # ---------------------- Display ----------------------
 
-def loop_list():
-    if not todo:
+def loop_list(query=None):
+    if not len(store):
         print("\t🗑️ Your To Do is Empty\n")
         return
-    for index, t in enumerate(todo, 1):
-        due = t["time"].strftime("%Y-%m-%d %H:%M") if t["time"] else "No time set"
-        print(f"\t{index}. {t['task']}  | State: {t['state']} | Due: {due}")
+    # Only the page on screen is fetched and formatted
+    results = pages(store.query(query or Query()), PAGE_SIZE)
+    page = next(results, None)
+    if page is None:
+        print("\t🔍 No matching tasks\n")
+        return
+    while page:
+        for t in page:
+            due = t.time.strftime("%Y-%m-%d %H:%M") if t.time else "No time set"
+            print(f"\t{t.id}. {t.task}  | State: {t.state} | Due: {due}")
+        page = next(results, None)
+        if page and input("\t-- Enter for more, q to stop -- ").strip().lower() == "q":
+            break
     print()
 
 
+def ask_date(prompt, end_of_day=False):
+    # Like todo_cli.parse_due: a bare date is midnight, or 23:59 with end_of_day
+    value = input(prompt).strip()
+    if not value:
+        return None
+    for fmt, bare in (("%Y-%m-%d %H:%M", False), ("%Y-%m-%d", True)):
+        try:
+            when = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return when.replace(hour=23, minute=59) if bare and end_of_day else when
+    print("⚠️ Invalid date, ignoring it.")
+    return None
+
+
+def ask_query():
+    state = input("Filter by state (Pending/Done/Overdue) or leave blank: ").strip().title() or None
+    text = input("Search text or leave blank: ").strip() or None
+    due_from = ask_date("Due from (YYYY-MM-DD [HH:MM]) or leave blank: ")
+    due_to = ask_date("Due until (YYYY-MM-DD [HH:MM]) or leave blank: ", end_of_day=True)
+    sort = "due" if input("Sort by due time? (y/N): ").strip().lower() == "y" else "id"
+    return Query(state=state, due_from=due_from, due_to=due_to, text=text, sort=sort)
+
+
+def ask_task_id(action):
+    # Tasks keep their number for life, deleting one doesn't renumber the rest
+    try:
+        return int(input(f"Enter task number to {action}: "))
+    except ValueError:
+        print("❌ Invalid input.")
+        return None
+
+
 # ---------------------- CRUD ----------------------
 
 def add_task():
@@ -64,72 +90,74 @@ def add_task():
             schedule_time = datetime.strptime(time_input, "%Y-%m-%d %H:%M")
         except ValueError:
             print("⚠️ Invalid time format. Task will have no schedule.")
-    todo.append({"task": task, "time": schedule_time, "state": "Pending"})
+    new_task = store.add(task, schedule_time)
+    scheduler.update(new_task)
     print(f"✅ Task '{task}' added.")
-    save_tasks()
 
 
 def show_task():
-    loop_list()
+    loop_list(ask_query())
     input("Press Enter to return...")
 
 
 def modify_task():
     loop_list()
-    try:
-        user_index = int(input("Enter task number to modify: ")) - 1
-        if 0 <= user_index < len(todo):
-            todo[user_index]["task"] = input("Modify the task to: ")
-            print("✅ Task modified.")
-            save_tasks()
-        else:
-            print("❌ Invalid index.")
-    except ValueError:
-        print("❌ Invalid input.")
+    task_id = ask_task_id("modify")
+    if task_id is None:
+        return
+    if store.get(task_id) is None:
+        print("❌ Invalid index.")
+        return
+    if store.rename(task_id, input("Modify the task to: ")):
+        print("✅ Task modified.")
+    else:
+        print("❌ Invalid index.")
 
 
 def delete_task():
     loop_list()
-    try:
-        user_index = int(input("Enter task number to delete: ")) - 1
-        if 0 <= user_index < len(todo):
-            removed = todo.pop(user_index)
-            print(f"🗑️ Task '{removed['task']}' deleted.")
-            save_tasks()
-        else:
-            print("❌ Invalid index.")
-    except ValueError:
-        print("❌ Invalid input.")
+    task_id = ask_task_id("delete")
+    if task_id is None:
+        return
+    removed = store.delete(task_id)
+    if removed:
+        scheduler.remove(removed)
+        print(f"🗑️ Task '{removed.task}' deleted.")
+    else:
+        print("❌ Invalid index.")
 
 
 def mark_done():
     loop_list()
-    try:
-        user_index = int(input("Enter task number to mark as done: ")) - 1
-        if 0 <= user_index < len(todo):
-            todo[user_index]["state"] = "Done"
-            print("✅ Task marked as done.")
-            save_tasks()
-        else:
-            print("❌ Invalid index.")
-    except ValueError:
-        print("❌ Invalid input.")
+    task_id = ask_task_id("mark as done")
+    if task_id is None:
+        return
+    task = store.set_state(task_id, "Done")
+    if task:
+        scheduler.update(task)
+        print("✅ Task marked as done.")
+    else:
+        print("❌ Invalid index.")
 
 
 # ---------------------- Reminders ----------------------
 
+def warn_upcoming(t):
+    print(f"\n⚠️ Upcoming Task: '{t.task}' at {t.time.strftime('%H:%M')}\n")
+
+
+def mark_overdue(t):
+    # Only Pending -> Overdue: if the user marked it done meanwhile, leave it alone
+    if store.set_state(t.id, "Overdue", only_from="Pending"):
+        print(f"\n⏰ Reminder: Task '{t.task}' is due now!\n")
+
+
+scheduler = ReminderScheduler(on_warning=warn_upcoming, on_due=mark_overdue)
+
+
 def reminder_worker():
-    while True:
-        now = datetime.now()
-        for t in todo:
-            if t["time"] and t["state"] == "Pending":
-                if now >= t["time"]:
-                    print(f"\n⏰ Reminder: Task '{t['task']}' is due now!\n")
-                    t["state"] = "Overdue"
-                    save_tasks()
-                elif now + timedelta(minutes=5) >= t["time"]:  # 5 min warning
-                    print(f"\n⚠️ Upcoming Task: '{t['task']}' at {t['time'].strftime('%H:%M')}\n")
-        time.sleep(60)  # check every minute
+    # Sleeps until the next warning or due time; task changes wake it early
+    scheduler.run_forever()
 
 
 # ---------------------- Main ----------------------
@@ -170,6 +198,9 @@ def main():
 
 
 if __name__ == "__main__":
+    # With arguments, run one command non-interactively (see todo_cli.py)
+    if len(sys.argv) > 1:
+        sys.exit(todo_cli.main(sys.argv[1:]))
     main()
 
 
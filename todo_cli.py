@@ -0,0 +1,252 @@
+# todo_cli.py
+# Non-interactive commands for todo.py, for scripts and bulk changes:
+#
+#   python todo.py add "Buy milk" "Call Bob" --due "2025-06-01 09:00"
+#   python todo.py add - < tasks.txt               one task per line
+#   python todo.py done --text milk --due-to 2025-06-01
+#   python todo.py import tasks.ndjson             or tasks.csv, or - for stdin
+#   python todo.py export --format csv --state Pending > pending.csv
+#
+# Import and export stream their rows: import reads BATCH_SIZE records at a
+# time and commits each batch in one backend write without keeping the tasks
+# in memory, so millions of rows load in seconds with flat memory on the
+# default sqlite backend. Records look like
+#
+#   {"task": "Buy milk", "time": "2025-06-01 09:00", "state": "Pending"}
+#
+# (CSV uses the same names as columns). time may be empty, a date or a date
+# and time; state defaults to Pending. Exported records also carry the id,
+# which import ignores: imported tasks always get new ids.
+import argparse
+import contextlib
+import csv
+import gc
+import json
+import sys
+
+from todo_query import Query, pages
+from todo_storage import format_time, open_backend, parse_time
+from todo_store import STATES, Task, TaskStore
+
+BATCH_SIZE = 20000  # records per backend write during import
+FIELDS = ("id", "task", "time", "state")
+
+
+def parse_due(value, end_of_day=False):
+    """A "YYYY-MM-DD HH:MM" or "YYYY-MM-DD" string (or nothing) as a datetime.
+
+    A bare date is midnight, or 23:59 with end_of_day, for the upper end of a range.
+    """
+    if not value:
+        return None
+    if len(value) == 10:
+        value += " 23:59" if end_of_day else " 00:00"
+    return parse_time(value)
+
+
+def guess_format(path, fmt):
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def open_input(path):
+    return sys.stdin if path == "-" else open(path, "r", encoding="utf-8", newline="")
+
+
+def open_output(path):
+    return sys.stdout if path == "-" else open(path, "w", encoding="utf-8", newline="")
+
+
+# ---------------------- Import / export ----------------------
+
+def read_records(f, fmt, chunk_lines=BATCH_SIZE):
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+        return
+    # One json.loads per chunk of lines is much cheaper than one per line
+    for number, chunk in enumerate(pages(f, chunk_lines)):
+        lines = [line for line in chunk if line.strip()]
+        try:
+            records = json.loads("[" + ",".join(lines) + "]")
+        except ValueError:
+            for offset, line in enumerate(chunk, number * chunk_lines + 1):
+                if not line.strip():
+                    continue
+                try:
+                    json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"line {offset}: {e}") from None
+            raise
+        yield from records
+
+
+def records_to_tasks(records):
+    for number, record in enumerate(records, 1):
+        try:
+            text = record["task"]
+            state = record.get("state") or "Pending"
+            if state not in STATES:
+                raise ValueError(f"unknown state '{state}'")
+            yield Task(None, text, parse_due(record.get("time")), state)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"record {number}: {e}") from None
+
+
+def import_tasks(store, f, fmt="ndjson", batch_size=BATCH_SIZE):
+    """Stream records from f into the store, one backend write per batch; returns the count."""
+    # Every record allocates a few containers, which keeps triggering cycle
+    # collections that find nothing to free; pause the collector meanwhile
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        batches = pages(records_to_tasks(read_records(f, fmt)), batch_size)
+        first = next(batches, [])
+        count = store.import_many(first)
+        if len(first) == batch_size:
+            # More than one batch coming: let the backend defer its index upkeep
+            with getattr(store.backend, "bulk_load", contextlib.nullcontext)():
+                for batch in batches:
+                    count += store.import_many(batch)
+    finally:
+        if was_enabled:
+            gc.enable()
+    store.save()
+    return count
+
+
+def write_records(f, fmt, tasks):
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        for page in pages(tasks, BATCH_SIZE):
+            writer.writerows((t.id, t.task, format_time(t.time) or "", t.state) for t in page)
+            count += len(page)
+        return count
+    for page in pages(tasks, BATCH_SIZE):
+        f.writelines(json.dumps({"id": t.id, "task": t.task, "time": format_time(t.time), "state": t.state},
+                                ensure_ascii=False) + "\n" for t in page)
+        count += len(page)
+    return count
+
+
+def export_tasks(store, f, fmt="ndjson", query=None):
+    return write_records(f, fmt, store.query(query or Query()))
+
+
+# ---------------------- Commands ----------------------
+
+def query_from_args(args):
+    return Query(state=args.state, due_from=parse_due(args.due_from),
+                 due_to=parse_due(args.due_to, end_of_day=True), text=args.text)
+
+
+def cmd_add(store, args):
+    texts = args.tasks
+    if texts == ["-"]:
+        texts = (line.strip() for line in sys.stdin)
+    due = parse_due(args.due)
+    count = 0
+    for batch in pages((Task(None, text, due) for text in texts if text), BATCH_SIZE):
+        store.add_many(batch)
+        count += len(batch)
+    print(f"✅ Added {count} tasks.", file=sys.stderr)
+
+
+def cmd_done(store, args):
+    query = query_from_args(args)
+    if not args.all and query.state is None and query.text is None and not query.has_due_range():
+        print("❌ Give a filter (--state, --text, --due-from, --due-to) or --all.", file=sys.stderr)
+        return 2
+    ids = [t.id for t in store.query(query) if t.state != "Done"]
+    if args.dry_run:
+        print(f"🔍 {len(ids)} tasks would be marked as done.", file=sys.stderr)
+        return 0
+    count = 0
+    for batch in pages(ids, BATCH_SIZE):
+        count += len(store.set_state_many(batch, "Done"))
+    print(f"✅ Marked {count} tasks as done.", file=sys.stderr)
+
+
+def cmd_import(store, args):
+    fmt = guess_format(args.file, args.format)
+    f = open_input(args.file)
+    first_id = store.next_id
+    try:
+        count = import_tasks(store, f, fmt, args.batch_size)
+    except ValueError as e:
+        # Earlier batches are already committed; say how far the import got
+        print(f"❌ {e} ({store.next_id - first_id} tasks were imported before it)", file=sys.stderr)
+        return 1
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    print(f"📦 Imported {count} tasks.", file=sys.stderr)
+
+
+def cmd_export(store, args):
+    fmt = guess_format(args.file, args.format)
+    f = open_output(args.file)
+    try:
+        count = export_tasks(store, f, fmt, query_from_args(args))
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    print(f"📤 Exported {count} tasks.", file=sys.stderr)
+
+
+def add_filters(parser):
+    parser.add_argument("--state", choices=STATES)
+    parser.add_argument("--text", help="substring of the task text, ignoring case")
+    parser.add_argument("--due-from", metavar="DATE", help='"YYYY-MM-DD" or "YYYY-MM-DD HH:MM"')
+    parser.add_argument("--due-to", metavar="DATE", help='"YYYY-MM-DD" (through that day) or "YYYY-MM-DD HH:MM"')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="todo.py",
+                                     description="Run without arguments for the interactive menu.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add tasks")
+    add.add_argument("tasks", nargs="+", help="task texts, or - to read one per line from stdin")
+    add.add_argument("--due", metavar="DATE", help="due time for all of them")
+    add.set_defaults(func=cmd_add)
+
+    done = commands.add_parser("done", help="mark every matching task as done")
+    add_filters(done)
+    done.add_argument("--all", action="store_true", help="mark every task when no filter is given")
+    done.add_argument("--dry-run", action="store_true", help="only count the matching tasks")
+    done.set_defaults(func=cmd_done)
+
+    imp = commands.add_parser("import", help="add tasks from an NDJSON or CSV file")
+    imp.add_argument("file", help="file to read, or - for stdin")
+    imp.add_argument("--format", choices=("ndjson", "csv"), help="default: from the file extension")
+    imp.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    imp.set_defaults(func=cmd_import, needs_tasks=False)
+
+    exp = commands.add_parser("export", help="write tasks as NDJSON or CSV")
+    exp.add_argument("file", nargs="?", default="-", help="file to write, default stdout")
+    exp.add_argument("--format", choices=("ndjson", "csv"), help="default: from the file extension")
+    add_filters(exp)
+    exp.set_defaults(func=cmd_export)
+    return parser
+
+
+def main(argv=None, store=None):
+    args = build_parser().parse_args(argv)
+    if store is None:
+        store = TaskStore(open_backend())
+    if getattr(args, "needs_tasks", True) or not hasattr(store.backend, "load_next_id"):
+        store.load()
+    else:
+        # import only needs the next id, which sqlite can tell without reading every task
+        store.next_id = store.backend.load_next_id()
+    try:
+        return args.func(store, args) or 0
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        store.save()
+        store.backend.close()
@@ -0,0 +1,169 @@
+# todo_query.py
+# Filtering, sorting and paging for large todo lists. TaskStore keeps a DueIndex
+# and a TextIndex up to date on every change, so queries only touch the tasks
+# they return instead of scanning the whole list.
+import bisect
+import itertools
+
+GRAM = 3
+
+
+class DueIndex:
+    """Due times kept sorted as (time, id) pairs; tasks without a time are tracked apart."""
+
+    def __init__(self):
+        self.entries = []
+        self.no_time = set()
+
+    def add(self, task):
+        if task.time is None:
+            self.no_time.add(task.id)
+        else:
+            bisect.insort(self.entries, (task.time, task.id))
+
+    def add_many(self, tasks):
+        self.entries.extend((t.time, t.id) for t in tasks if t.time is not None)
+        self.entries.sort()
+        self.no_time.update(t.id for t in tasks if t.time is None)
+
+    def remove(self, task):
+        if task.time is None:
+            self.no_time.discard(task.id)
+            return
+        i = bisect.bisect_left(self.entries, (task.time, task.id))
+        if i < len(self.entries) and self.entries[i] == (task.time, task.id):
+            del self.entries[i]
+
+    def span(self, start=None, end=None):
+        lo = 0 if start is None else bisect.bisect_left(self.entries, (start,))
+        hi = len(self.entries) if end is None else bisect.bisect_right(self.entries, (end, float("inf")))
+        return lo, max(lo, hi)
+
+    def between(self, start=None, end=None):
+        """(time, id) pairs due in [start, end], earliest first, as a copied slice."""
+        lo, hi = self.span(start, end)
+        return self.entries[lo:hi]
+
+    def count_between(self, start=None, end=None):
+        lo, hi = self.span(start, end)
+        return hi - lo
+
+
+def grams(text):
+    text = text.lower()
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class TextIndex:
+    """Inverted index from 3-character grams of the task text to task ids.
+
+    A substring query can only match tasks that contain all of its grams, so
+    intersecting the posting sets narrows the candidates before the real
+    substring check.
+    """
+
+    def __init__(self):
+        self.postings = {}
+
+    def add(self, task):
+        for gram in grams(task.task):
+            self.postings.setdefault(gram, set()).add(task.id)
+
+    def remove(self, task):
+        for gram in grams(task.task):
+            ids = self.postings.get(gram)
+            if ids is not None:
+                ids.discard(task.id)
+                if not ids:
+                    del self.postings[gram]
+
+    def candidates(self, text):
+        """Ids that may contain text, or None if text is too short to narrow anything."""
+        needed = grams(text)
+        if not needed:
+            return None
+        sets = sorted((self.postings.get(g, set()) for g in needed), key=len)
+        result = set(sets[0])
+        for ids in sets[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+
+class Query:
+    def __init__(self, state=None, due_from=None, due_to=None, text=None, sort="id"):
+        if sort not in ("id", "due"):
+            raise ValueError(f"Unknown sort '{sort}', use 'id' or 'due'")
+        self.state = state
+        self.due_from = due_from
+        self.due_to = due_to
+        self.text = text.lower() if text else None
+        self.sort = sort
+
+    def has_due_range(self):
+        return self.due_from is not None or self.due_to is not None
+
+    def run(self, store):
+        """Lazily yield matching tasks in the requested order."""
+        with store.lock:
+            # Copies of the narrowing sets, so results don't change under a running page
+            filters = []
+            if self.state is not None:
+                filters.append(set(store.by_state.get(self.state, ())))
+            if self.text is not None:
+                found = store.ensure_text_index().candidates(self.text)
+                if found is not None:
+                    filters.append(found)
+            filters.sort(key=len)
+
+            if self.sort == "due" or (self.has_due_range() and (
+                    not filters or store.due_index.count_between(self.due_from, self.due_to) < len(filters[0]))):
+                due = store.due_index.between(self.due_from, self.due_to)
+                if self.sort == "id":
+                    ordered = sorted(task_id for _, task_id in due)
+                else:
+                    ordered = (task_id for _, task_id in due)
+                    if not self.has_due_range():
+                        # Tasks without a time come after everything that has one
+                        ordered = itertools.chain(ordered, sorted(store.due_index.no_time))
+            elif filters:
+                ordered = sorted(filters.pop(0))
+            else:
+                ordered = list(store.tasks)
+
+        return self._filter(store, ordered, filters)
+
+    def _filter(self, store, ordered, filters):
+        for task_id in ordered:
+            if any(task_id not in ids for ids in filters):
+                continue
+            task = store.get(task_id)
+            if task is None or not self._matches(task):
+                continue
+            yield task
+
+    def _matches(self, task):
+        # Final check on the record itself; the indexes only narrow candidates
+        if self.state is not None and task.state != self.state:
+            return False
+        if self.text is not None and self.text not in task.task.lower():
+            return False
+        if self.has_due_range():
+            if task.time is None:
+                return False
+            if self.due_from is not None and task.time < self.due_from:
+                return False
+            if self.due_to is not None and task.time > self.due_to:
+                return False
+        return True
+
+
+def pages(tasks, page_size):
+    """Split a lazy result into lists of page_size, one page built at a time."""
+    tasks = iter(tasks)
+    while True:
+        page = list(itertools.islice(tasks, page_size))
+        if not page:
+            return
+        yield page
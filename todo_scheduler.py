@@ -0,0 +1,149 @@
+# todo_scheduler.py
+# Reminder scheduling for todo.py. Pending tasks with a time get two entries in
+# a min-heap: the 5-minute warning and the due time. The worker sleeps on a
+# condition variable until the earliest entry, and any change to a task wakes
+# it so the new deadline is taken into account.
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta
+
+WARNING = "warning"
+DUE = "due"
+WARNING_BEFORE = timedelta(minutes=5)
+MAX_SLEEP = 3600  # seconds; re-read the wall clock at least this often in case it jumps
+
+
+class ReminderScheduler:
+    def __init__(self, on_warning, on_due, clock=datetime.now, warning_before=WARNING_BEFORE):
+        self.on_warning = on_warning
+        self.on_due = on_due
+        self.clock = clock
+        self.warning_before = warning_before
+        self.cond = threading.Condition()
+        self.heap = []  # (when, seq, kind, task id, generation)
+        self.tasks = {}  # task id -> (task, generation, entries still in the heap)
+        self.seq = itertools.count()
+        self.generation = itertools.count()
+        self.stale = 0  # heap entries left behind by updates and removals
+        self.stopped = False
+
+    # ---------------------- Changes ----------------------
+
+    def update(self, task):
+        """Schedule a task, or reschedule it after its time or state changed."""
+        with self.cond:
+            self._drop(task.id)
+            if task.time and task.state == "Pending":
+                self._push(task)
+            self._maybe_compact()
+            self.cond.notify()
+
+    def update_many(self, tasks):
+        # Bulk load: build the heap in O(n) instead of n pushes
+        with self.cond:
+            for task in tasks:
+                self._drop(task.id)
+                if task.time and task.state == "Pending":
+                    self._push(task, heapify=False)
+            heapq.heapify(self.heap)
+            self._maybe_compact()
+            self.cond.notify()
+
+    def remove(self, task):
+        with self.cond:
+            self._drop(task.id)
+            self._maybe_compact()
+            self.cond.notify()
+
+    def stop(self):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify()
+
+    def _push(self, task, heapify=True):
+        gen = next(self.generation)
+        self.tasks[task.id] = (task, gen, 2)
+        push = heapq.heappush if heapify else list.append
+        push(self.heap, (task.time - self.warning_before, next(self.seq), WARNING, task.id, gen))
+        push(self.heap, (task.time, next(self.seq), DUE, task.id, gen))
+
+    def _drop(self, task_id):
+        # Entries stay in the heap and are skipped when they surface
+        entry = self.tasks.pop(task_id, None)
+        if entry is not None:
+            self.stale += entry[2]
+
+    def _maybe_compact(self):
+        if self.stale > 1024 and self.stale > len(self.heap) // 2:
+            self.heap = [e for e in self.heap if self._is_live(e)]
+            heapq.heapify(self.heap)
+            self.stale = 0
+
+    def _is_live(self, entry):
+        current = self.tasks.get(entry[3])
+        return current is not None and current[1] == entry[4]
+
+    # ---------------------- Firing ----------------------
+
+    def next_deadline(self):
+        with self.cond:
+            self._discard_stale()
+            return self.heap[0][0] if self.heap else None
+
+    def _discard_stale(self):
+        heap = self.heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+            self.stale -= 1
+
+    def _pop_ready(self, now):
+        ready = []
+        heap = self.heap
+        while True:
+            self._discard_stale()
+            if not heap or heap[0][0] > now:
+                return ready
+            _, _, kind, task_id, _ = heapq.heappop(heap)
+            task, gen, entries = self.tasks[task_id]
+            if kind == DUE:
+                # A warning still queued behind it is dead now
+                del self.tasks[task_id]
+                self.stale += entries - 1
+                ready.append((DUE, task))
+                continue
+            self.tasks[task_id] = (task, gen, entries - 1)
+            if task.time > now:
+                # Only warn if the task isn't already due
+                ready.append((WARNING, task))
+
+    def _fire(self, ready):
+        for kind, task in ready:
+            if kind == DUE:
+                self.on_due(task)
+            else:
+                self.on_warning(task)
+
+    def run_pending(self):
+        """Fire everything due at clock() without blocking; returns what fired."""
+        with self.cond:
+            ready = self._pop_ready(self.clock())
+        self._fire(ready)
+        return ready
+
+    def run_forever(self):
+        while True:
+            with self.cond:
+                while not self.stopped:
+                    now = self.clock()
+                    ready = self._pop_ready(now)
+                    if ready:
+                        break
+                    timeout = MAX_SLEEP
+                    if self.heap:
+                        timeout = min(timeout, (self.heap[0][0] - now).total_seconds())
+                    self.cond.wait(timeout)
+                if self.stopped:
+                    return
+            # Callbacks may call update(), so run them without holding the lock
+            self._fire(ready)
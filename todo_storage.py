@@ -0,0 +1,464 @@
+# todo_storage.py
+# Storage backends for todo.py. Every backend stores todo_store.Task records
+# (ids are assigned by the TaskStore) and offers:
+#
+#   load()          -> list of tasks
+#   add(task)       store a new task
+#   add_many(tasks) same as add() for a batch, in one write
+#   update(task)    persist the current fields of an existing task
+#   update_many(tasks) same as update() for a batch, in one write
+#   delete(task)    forget a task
+#   save()          flush everything (called on exit)
+#   close()
+import contextlib
+import functools
+import glob
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime
+
+from todo_store import Task
+
+TIME_FORMAT = "%Y-%m-%d %H:%M"
+JSON_PATH = "todo.json"
+SQLITE_PATH = "todo.db"
+SNAPSHOT_PATH = "todo.snapshot.json"
+JOURNAL_PATH = "todo.journal"
+COMPACT_THRESHOLD = 4 * 1024 * 1024  # journal bytes before a snapshot is taken
+DEFAULT_BACKEND = "sqlite"
+PARSE_CACHE_SIZE = 65536  # distinct times remembered by parse_time and format_time
+SQLITE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state)",
+    "CREATE INDEX IF NOT EXISTS tasks_time ON tasks (time)",
+)
+
+
+def format_time(value):
+    return _format_time(value) if value else None
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _format_time(value):
+    return value.strftime(TIME_FORMAT)
+
+
+def parse_time(value):
+    return _parse_time(value) if value else None
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_time(value):
+    # Large lists repeat the same due times a lot, and slicing the fixed-width
+    # format is several times faster than strptime; anything unusual still
+    # goes through strptime so errors read the same.
+    if (len(value) == 16 and value[4] == value[7] == "-" and value[10] == " " and value[13] == ":"
+            and (value[0:4] + value[5:7] + value[8:10] + value[11:13] + value[14:16]).isdigit()):
+        try:
+            return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                            int(value[11:13]), int(value[14:16]))
+        except ValueError:
+            pass
+    return datetime.strptime(value, TIME_FORMAT)
+
+
+def write_atomic(path, write, fsync=True):
+    # Write a sibling temp file and swap it in, so a crash leaves the old file intact.
+    # Each call gets its own temp file, so concurrent writers never rename each other's.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def read_json_tasks(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    # Files from before ids were stored fall back to numbering by position
+    return [Task(d.get("id", i), d["task"], parse_time(d["time"]), d["state"]) for i, d in enumerate(data, 1)]
+
+
+class JsonBackend:
+    """The original todo.json format: the whole list is rewritten on every change.
+
+    Each record also stores its id, so ids survive restarts. The file has no
+    counter, though: if the task with the highest id is deleted, that id is
+    handed out again after a restart. The sqlite and journal backends never reuse ids.
+    """
+
+    def __init__(self, path=JSON_PATH):
+        self.path = path
+        self.tasks = {}  # id -> Task
+        self.lock = threading.Lock()
+        # Held from taking the copy to the rename, so an older copy never replaces a newer one
+        self.write_lock = threading.Lock()
+        self.deferred = False
+
+    def load(self):
+        try:
+            tasks = read_json_tasks(self.path)
+        except FileNotFoundError:
+            tasks = []
+        self.tasks = {t.id: t for t in tasks}
+        return tasks
+
+    def add(self, task):
+        self.add_many([task])
+
+    def add_many(self, tasks):
+        with self.lock:
+            for task in tasks:
+                self.tasks[task.id] = task
+        if not self.deferred:
+            self.save()
+
+    @contextlib.contextmanager
+    def bulk_load(self):
+        # Rewriting the whole file after every batch would make large imports quadratic
+        self.deferred = True
+        try:
+            yield
+        finally:
+            self.deferred = False
+            self.save()
+
+    def update(self, task):
+        self.save()
+
+    def update_many(self, tasks):
+        self.save()
+
+    def delete(self, task):
+        with self.lock:
+            self.tasks.pop(task.id, None)
+        self.save()
+
+    def save(self):
+        with self.write_lock:
+            with self.lock:
+                data = [
+                    {"id": t.id, "task": t.task, "time": format_time(t.time), "state": t.state}
+                    for t in self.tasks.values()
+                ]
+            write_atomic(self.path, lambda f: json.dump(data, f, indent=4))
+
+    def close(self):
+        pass
+
+
+class SqliteBackend:
+    """One row per task, indexed on state and time. Each change is a single-row transaction.
+
+    The next id is kept in the meta table, so deleting the newest task doesn't
+    free its id for reuse.
+    """
+
+    def __init__(self, path=SQLITE_PATH, import_path=JSON_PATH):
+        self.path = path
+        self.import_path = import_path
+        self.next_id = 1
+        # The reminder thread writes too, so share one connection behind a lock
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY,
+                    task TEXT NOT NULL,
+                    time TEXT,
+                    state TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                """
+            )
+            # Also brings back indexes a bulk_load() interrupted by a crash left out
+            for statement in SQLITE_INDEXES:
+                self.conn.execute(statement)
+        self.import_json_once()
+
+    def import_json_once(self):
+        # Bring an existing todo.json over the first time the database is opened
+        with self.lock, self.conn:
+            done = self.conn.execute("SELECT value FROM meta WHERE key = 'json_imported'").fetchone()
+            if done:
+                return
+            try:
+                tasks = read_json_tasks(self.import_path)
+            except FileNotFoundError:
+                tasks = []
+            self.conn.executemany(
+                "INSERT INTO tasks (id, task, time, state) VALUES (?, ?, ?, ?)",
+                [(t.id, t.task, format_time(t.time), t.state) for t in tasks],
+            )
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('json_imported', ?)",
+                (datetime.now().strftime(TIME_FORMAT),),
+            )
+        if tasks:
+            print(f"📦 Imported {len(tasks)} tasks from {self.import_path}")
+
+    def load_next_id(self):
+        """The next unused id, without loading any tasks."""
+        with self.lock:
+            stored = self.conn.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()
+            highest = self.conn.execute("SELECT MAX(id) FROM tasks").fetchone()[0]
+            self.next_id = max(int(stored[0]) if stored else 1, (highest or 0) + 1)
+            return self.next_id
+
+    def load(self):
+        self.load_next_id()
+        with self.lock:
+            rows = self.conn.execute("SELECT id, task, time, state FROM tasks ORDER BY id").fetchall()
+        return [Task(row[0], row[1], parse_time(row[2]), row[3]) for row in rows]
+
+    def add(self, task):
+        self.add_many([task])
+
+    def add_many(self, tasks):
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO tasks (id, task, time, state) VALUES (?, ?, ?, ?)",
+                [(t.id, t.task, format_time(t.time), t.state) for t in tasks],
+            )
+            if tasks:
+                self.next_id = max(self.next_id, max(t.id for t in tasks) + 1)
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('next_id', ?)",
+                                  (str(self.next_id),))
+
+    @contextlib.contextmanager
+    def bulk_load(self):
+        """Drop the secondary indexes around many add_many() calls and rebuild them once after.
+
+        Keeping the time index sorted row by row costs more than the inserts
+        themselves; one sort at the end is several times faster for large loads.
+        """
+        with self.lock, self.conn:
+            self.conn.execute("DROP INDEX IF EXISTS tasks_state")
+            self.conn.execute("DROP INDEX IF EXISTS tasks_time")
+        try:
+            yield
+        finally:
+            with self.lock, self.conn:
+                for statement in SQLITE_INDEXES:
+                    self.conn.execute(statement)
+
+    def update(self, task):
+        self.update_many([task])
+
+    def update_many(self, tasks):
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "UPDATE tasks SET task = ?, time = ?, state = ? WHERE id = ?",
+                [(t.task, format_time(t.time), t.state, t.id) for t in tasks],
+            )
+
+    def delete(self, task):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM tasks WHERE id = ?", (task.id,))
+
+    def save(self):
+        # Every change is already committed
+        pass
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class JournalBackend:
+    """Append-only journal of changes on top of a periodic snapshot.
+
+    Each change appends one compact JSON line to todo.journal.<generation>:
+
+        ["a", id, task, time, state]   add
+        ["u", id, task, time, state]   modify / state change
+        ["d", id]                      delete
+
+    Once the current journal grows past compact_threshold a new generation is
+    started and a background thread writes the snapshot, which records the
+    generation it covers up to. Loading reads the snapshot and replays every
+    journal from that generation on; a torn last line from a crash is ignored.
+    """
+
+    def __init__(self, snapshot_path=SNAPSHOT_PATH, journal_path=JOURNAL_PATH,
+                 import_path=JSON_PATH, compact_threshold=COMPACT_THRESHOLD, fsync=False):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.import_path = import_path
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        self.lock = threading.Lock()
+        self.tasks = {}  # id -> Task, needed to write snapshots
+        self.next_id = 1  # ids are never reused, even after the highest one is deleted
+        self.generation = 0
+        self.journal = None
+        self.compactor = None
+
+    def journal_file(self, generation):
+        return f"{self.journal_path}.{generation}"
+
+    def journal_generations(self):
+        prefix = f"{self.journal_path}."
+        generations = []
+        for path in glob.glob(glob.escape(prefix) + "*"):
+            suffix = path[len(prefix):]
+            if suffix.isdigit():
+                generations.append(int(suffix))
+        return sorted(generations)
+
+    def load(self):
+        by_id = {}
+        start = 0
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            start = snapshot["journal"]
+            self.next_id = snapshot["next_id"]
+            for task_id, task, time_str, state in snapshot["tasks"]:
+                by_id[task_id] = Task(task_id, task, parse_time(time_str), state)
+        except FileNotFoundError:
+            generations = self.journal_generations()
+            if not generations:
+                # First run: start from the existing todo.json, if any
+                try:
+                    for t in read_json_tasks(self.import_path):
+                        by_id[t.id] = t
+                    self.next_id = max(by_id, default=0) + 1
+                except FileNotFoundError:
+                    pass
+
+        self.generation = start
+        for generation in self.journal_generations():
+            if generation >= start:
+                self.replay(self.journal_file(generation), by_id)
+                self.generation = generation
+
+        self.tasks = by_id
+        self.journal = open(self.journal_file(self.generation), "a", encoding="utf-8")
+        if not os.path.exists(self.snapshot_path):
+            self.compact()
+        return list(by_id.values())
+
+    def replay(self, path, by_id):
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        if lines and not lines[-1].endswith("\n"):
+            # Every record is written with its newline, so this one was cut short
+            # by a crash. Drop it so new appends start on a fresh line.
+            lines.pop()
+            with open(path, "r+b") as f:
+                f.truncate(sum(len(line.encode("utf-8")) for line in lines))
+        for line in lines:
+            record = json.loads(line)
+            op, task_id = record[0], record[1]
+            if op == "d":
+                by_id.pop(task_id, None)
+            elif op == "a" or task_id in by_id:
+                by_id[task_id] = Task(task_id, record[2], parse_time(record[3]), record[4])
+            self.next_id = max(self.next_id, task_id + 1)
+
+    def append(self, records):
+        with self.lock:
+            self.journal.write("".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n"
+                                       for r in records))
+            self.journal.flush()
+            if self.fsync:
+                os.fsync(self.journal.fileno())
+            if self.journal.tell() > self.compact_threshold and self.compactor is None:
+                self.rotate()
+
+    def add(self, task):
+        self.add_many([task])
+
+    def add_many(self, tasks):
+        with self.lock:
+            for task in tasks:
+                self.tasks[task.id] = task
+                self.next_id = max(self.next_id, task.id + 1)
+        self.append(["a", t.id, t.task, format_time(t.time), t.state] for t in tasks)
+
+    def update(self, task):
+        self.update_many([task])
+
+    def update_many(self, tasks):
+        self.append(["u", t.id, t.task, format_time(t.time), t.state] for t in tasks)
+
+    def delete(self, task):
+        with self.lock:
+            self.tasks.pop(task.id, None)
+        self.append([["d", task.id]])
+
+    def rotate(self):
+        # Called with the lock held: freeze the state and start the next journal
+        # generation, then let a background thread write the snapshot.
+        rows = [(t.id, t.task, format_time(t.time), t.state) for t in self.tasks.values()]
+        self.journal.close()
+        self.generation += 1
+        self.journal = open(self.journal_file(self.generation), "a", encoding="utf-8")
+        self.compactor = threading.Thread(
+            target=self.write_snapshot, args=(rows, self.generation, self.next_id), daemon=True
+        )
+        self.compactor.start()
+
+    def write_snapshot(self, rows, generation, next_id):
+        snapshot = {"journal": generation, "next_id": next_id, "tasks": rows}
+        write_atomic(self.snapshot_path,
+                     lambda f: json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":")))
+        # Older journals are fully covered by the snapshot now
+        for old in self.journal_generations():
+            if old < generation:
+                os.remove(self.journal_file(old))
+        with self.lock:
+            self.compactor = None
+
+    def compact(self):
+        with self.lock:
+            if self.compactor is None:
+                self.rotate()
+            compactor = self.compactor
+        compactor.join()
+
+    def save(self):
+        with self.lock:
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+
+    def close(self):
+        with self.lock:
+            compactor = self.compactor
+        if compactor is not None:
+            compactor.join()
+        with self.lock:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+
+
+BACKENDS = {
+    "json": JsonBackend,
+    "sqlite": SqliteBackend,
+    "journal": JournalBackend,
+}
+
+
+def open_backend(name=None):
+    # TODO_BACKEND=json keeps the old single-file behaviour, TODO_BACKEND=journal
+    # appends each change to a journal that is compacted into snapshots
+    name = name or os.environ.get("TODO_BACKEND", DEFAULT_BACKEND)
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown backend '{name}', choose from {', '.join(BACKENDS)}") from None
@@ -0,0 +1,186 @@
+# todo_store.py
+# In-memory task model for todo.py. Tasks get a stable integer id when they are
+# created; the store indexes them by id and by state and forwards every change
+# to a storage backend (see todo_storage.py). Query indexes (todo_query.py) are
+# maintained alongside.
+import threading
+
+from todo_query import DueIndex, TextIndex
+
+STATES = ("Pending", "Done", "Overdue")
+
+
+class Task:
+    __slots__ = ("id", "task", "time", "state")
+
+    def __init__(self, id, task, time=None, state="Pending"):
+        self.id = id
+        self.task = task
+        self.time = time
+        self.state = state
+
+    def __repr__(self):
+        return f"Task(id={self.id!r}, task={self.task!r}, time={self.time!r}, state={self.state!r})"
+
+
+class TaskStore:
+    """Thread-safe task index shared by the menu and the reminder thread.
+
+    The lock only guards the in-memory index and is never held while the
+    backend writes, so a slow disk doesn't block readers. Backends persist a
+    task's current fields at write time, so the last write always carries the
+    latest state even when two threads change the same task.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.lock = threading.Lock()
+        self.tasks = {}  # id -> Task, in id order
+        self.by_state = {state: set() for state in STATES}
+        self.due_index = DueIndex()
+        self.text_index = None  # built on the first text search, then kept up to date
+        self.next_id = 1
+
+    def load(self):
+        tasks = self.backend.load()
+        with self.lock:
+            self.tasks = {t.id: t for t in tasks}
+            self.by_state = {state: set() for state in STATES}
+            for t in tasks:
+                self.by_state.setdefault(t.state, set()).add(t.id)
+            self.due_index = DueIndex()
+            self.due_index.add_many(tasks)
+            self.text_index = None
+            self.next_id = max(self.tasks, default=0) + 1
+            self.next_id = max(self.next_id, getattr(self.backend, "next_id", 1))
+        return tasks
+
+    # ---------------------- Reads ----------------------
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def get(self, task_id):
+        return self.tasks.get(task_id)
+
+    def all(self):
+        with self.lock:
+            return list(self.tasks.values())
+
+    def with_state(self, state):
+        with self.lock:
+            return [self.tasks[i] for i in sorted(self.by_state.get(state, ()))]
+
+    def count(self, state):
+        return len(self.by_state.get(state, ()))
+
+    def ensure_text_index(self):
+        # Caller holds the lock
+        if self.text_index is None:
+            self.text_index = TextIndex()
+            for task in self.tasks.values():
+                self.text_index.add(task)
+        return self.text_index
+
+    # ---------------------- Changes ----------------------
+
+    def _insert(self, task):
+        # Caller holds the lock
+        task.id = self.next_id
+        self.next_id += 1
+        self.tasks[task.id] = task
+        self.by_state.setdefault(task.state, set()).add(task.id)
+        if self.text_index is not None:
+            self.text_index.add(task)
+
+    def add(self, text, time=None, state="Pending"):
+        task = Task(None, text, time, state)
+        with self.lock:
+            self._insert(task)
+            self.due_index.add(task)
+        self.backend.add(task)
+        return task
+
+    def add_many(self, tasks):
+        """Insert Task records (their ids are assigned here) in one backend write."""
+        with self.lock:
+            for task in tasks:
+                self._insert(task)
+            self.due_index.add_many(tasks)
+        self.backend.add_many(tasks)
+        return tasks
+
+    def import_many(self, tasks):
+        """Assign ids and write tasks straight to the backend, without indexing them.
+
+        For bulk imports that stream far more tasks than should be held in
+        memory: the store doesn't see the new tasks until load() is called again.
+        """
+        with self.lock:
+            for task in tasks:
+                task.id = self.next_id
+                self.next_id += 1
+        self.backend.add_many(tasks)
+        return len(tasks)
+
+    def rename(self, task_id, text):
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None:
+                return None
+            if self.text_index is not None:
+                self.text_index.remove(task)
+            task.task = text
+            if self.text_index is not None:
+                self.text_index.add(task)
+        self.backend.update(task)
+        return task
+
+    def set_state(self, task_id, state, only_from=None):
+        """Change a task's state; with only_from, only if it is currently in that state.
+
+        Returns the task, or None if it doesn't exist or was in another state.
+        """
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None or (only_from is not None and task.state != only_from):
+                return None
+            self.by_state[task.state].discard(task_id)
+            task.state = state
+            self.by_state.setdefault(state, set()).add(task_id)
+        self.backend.update(task)
+        return task
+
+    def set_state_many(self, task_ids, state, only_from=None):
+        """set_state() for many tasks in one backend write; returns the tasks that changed."""
+        changed = []
+        with self.lock:
+            for task_id in task_ids:
+                task = self.tasks.get(task_id)
+                if task is None or task.state == state or (only_from is not None and task.state != only_from):
+                    continue
+                self.by_state[task.state].discard(task_id)
+                task.state = state
+                self.by_state.setdefault(state, set()).add(task_id)
+                changed.append(task)
+        if changed:
+            self.backend.update_many(changed)
+        return changed
+
+    def delete(self, task_id):
+        with self.lock:
+            task = self.tasks.pop(task_id, None)
+            if task is None:
+                return None
+            self.by_state[task.state].discard(task_id)
+            self.due_index.remove(task)
+            if self.text_index is not None:
+                self.text_index.remove(task)
+        self.backend.delete(task)
+        return task
+
+    def query(self, query):
+        return query.run(self)
+
+    def save(self):
+        self.backend.save()
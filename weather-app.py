@@ -1,16 +1,31 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import requests
 from datetime import datetime, timedelta
 import json
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import matplotlib.dates as mdates
-from PIL import Image, ImageTk
-import io
+import threading
 import time
 
+from weather_cache import ResponseCache
+from weather_cards import CONFIGURE_DEBOUNCE_MS, CardPool, Debouncer
+from weather_fetch import FetchPipeline, TkDispatcher
+from weather_icons import IconCache
+from weather_model import ForecastModel, to_datetime
+from weather_perf import attach_overlay, profiled, recorder, span, timed
+from weather_provider import open_provider
+from weather_refresh import INTERVAL, JITTER, RefreshScheduler
+from weather_units import convert_speed, convert_temperature, speed_symbol, temperature_symbol
+from weather_watchlist import Watchlist, WatchlistView
+
+CHART_DELAY_MS = 50  # lets the window paint before the figure is built
+
+
+def warm_imports():
+    # Importing here means create_chart usually finds the modules ready
+    import matplotlib.backends.backend_tkagg
+    import matplotlib.figure
+    import weather_chart
+
+
 class WeatherApp:
     def __init__(self, root):
         self.root = root
@@ -24,17 +39,69 @@ class WeatherApp:
         # Default city
         self.current_city = "London"
         
-        # Units (metric for Celsius, imperial for Fahrenheit)
+        # Units (metric for Celsius, imperial for Fahrenheit). Data is always
+        # fetched in metric and converted locally for display.
         self.units = "metric"
+        self.current_data = None
+        self.forecast_data = None
+        self.icon_code = None
+        
+        # Background refresh interval; divisors of 3 hours stay in step with the forecast
+        self.refresh_minutes = INTERVAL // 60
+        self.updated_at = None
+        
+        # Network requests run in the background, results come back on the Tk thread
+        self.dispatcher = TkDispatcher(self.root)
+        self.fetcher = FetchPipeline(self.dispatcher.post)
+        self.pending_parts = set()
+        self.search_started = None
+        
+        # All requests go through one provider: a pooled HTTPS session, or recorded fixtures
+        self.provider = open_provider(self.api_key)
+        
+        # Responses are cached on disk so repeat searches and restarts skip the network
+        self.cache = ResponseCache()
+        self.showing_cached = False
+        
+        # Condition icons are cached in memory and on disk, warmed in the background
+        self.icons = IconCache(self.provider.icon)
+        self.icons.prefetch()
+        # Icon loads have their own pipeline: a new search or a failed fetch must
+        # not drop a load that is still decoding, or that icon would never show
+        self.icon_fetcher = FetchPipeline(self.dispatcher.post, max_workers=1)
+        
+        # Watchlist mode: many cities fetched in batches through the group endpoint
+        self.watchlist_names = []
+        self.watchlist = Watchlist(self.provider)
+        self.watchlist_fetcher = FetchPipeline(self.dispatcher.post, max_workers=1)
+        self.watchlist_view = None
+        self.watchlist_results = ({}, {})
         
         # Create GUI
         self.create_widgets()
         
+        # With WEATHER_PERF set, F12 shows where the time goes (see weather_perf.py)
+        self.perf_overlay = attach_overlay(self.root)
+        
         # Load last searched city if available
         self.load_last_city()
         
-        # Get initial weather data
+        # Get initial weather data; cached data is shown straight away
         self.get_weather_data()
+        
+        # Load the chart libraries in the background while the window comes up
+        threading.Thread(target=warm_imports, name="weather-imports", daemon=True).start()
+        
+        # Keep the city and the watchlist up to date in the background
+        self.refresher = RefreshScheduler(interval=self.refresh_minutes * 60)
+        self.refresher.add("city", self.refresh_city,
+                           lambda result: self.dispatcher.post(self.on_city_refreshed, result),
+                           lambda error, retry_in: self.dispatcher.post(self.on_refresh_error, error, retry_in))
+        self.refresher.add("watchlist", self.refresh_watchlist_names,
+                           lambda results: self.dispatcher.post(self.on_watchlist_loaded, results),
+                           lambda error, retry_in: self.dispatcher.post(self.on_refresh_error, error, retry_in))
+        self.refresher.start()
+        self.root.after(60 * 1000, self.check_staleness)
     
     def create_widgets(self):
         # Main frame
@@ -62,6 +129,7 @@ class WeatherApp:
         self.city_entry.bind('<Return>', lambda e: self.get_weather_data())
         
         ttk.Button(search_frame, text="Search", command=self.get_weather_data).grid(row=0, column=2, padx=5)
+        ttk.Button(search_frame, text="Watchlist", command=self.open_watchlist).grid(row=0, column=3, padx=5)
         
         # Units frame
         units_frame = ttk.Frame(main_frame)
@@ -118,11 +186,16 @@ class WeatherApp:
         self.scrollbar = ttk.Scrollbar(forecast_frame, orient="horizontal", command=self.canvas.xview)
         self.scrollable_frame = ttk.Frame(self.canvas)
         
+        # Resizes arrive in bursts; recompute the scroll region once they settle
         self.scrollable_frame.bind(
             "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+            Debouncer(self.canvas, CONFIGURE_DEBOUNCE_MS,
+                      lambda: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
         )
         
+        # Day cards are created once and refreshed in place
+        self.cards = CardPool(self.scrollable_frame)
+        
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
         self.canvas.configure(xscrollcommand=self.scrollbar.set)
         
@@ -135,11 +208,14 @@ class WeatherApp:
         chart_frame.columnconfigure(0, weight=1)
         chart_frame.rowconfigure(0, weight=1)
         
-        # Create matplotlib figure
-        self.fig = Figure(figsize=(8, 4), dpi=100)
-        self.ax = self.fig.add_subplot(111)
-        self.canvas_chart = FigureCanvasTkAgg(self.fig, chart_frame)
-        self.canvas_chart.get_tk_widget().grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        # The matplotlib figure is created after the window has painted (see
+        # create_chart); until then a placeholder of the same size holds its place
+        self.chart_frame = chart_frame
+        self.chart = None
+        self.chart_model = None
+        self.chart_placeholder = ttk.Frame(chart_frame, width=800, height=400)
+        self.chart_placeholder.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        ttk.Label(self.chart_placeholder, text="Loading chart...").place(relx=0.5, rely=0.5, anchor="center")
         
         # Status bar
         self.status_var = tk.StringVar()
@@ -149,7 +225,16 @@ class WeatherApp:
         
     def change_units(self):
         self.units = self.unit_var.get()
-        self.get_weather_data()
+        self.save_last_city()
+        
+        # Re-render what we already have; no network round trip needed
+        if self.current_data is not None:
+            self.update_current_weather(self.current_data)
+        if self.forecast_data is not None:
+            self.update_forecast(self.forecast_data)
+            self.update_chart(self.forecast_data)
+        if self.watchlist_view is not None:
+            self.watchlist_view.show(*self.watchlist_results, self.units)
     
     def get_weather_data(self):
         city = self.city_var.get().strip()
@@ -159,61 +244,149 @@ class WeatherApp:
             self.current_city = city
             self.save_last_city()
         
-        self.status_var.set(f"Fetching weather data for {city}...")
-        self.root.update()
-        
+        # A new search supersedes whatever is still in flight for the previous one
+        generation = self.fetcher.new_generation()
+        self.pending_parts = set()
+        self.search_started = time.perf_counter_ns()
+        self.showing_cached = False
+        params = {"q": city}
+        
+        for part, endpoint in (("current", "weather"), ("forecast", "forecast")):
+            data, fresh = self.cache.get(endpoint, city, "metric")
+            if data is not None:
+                # Show what we have straight away; stale data is refreshed below
+                self.showing_cached = True
+                if not self.render_part(part, data):
+                    return
+            if not fresh:
+                # Current weather and 5-day forecast are fetched at the same time
+                self.pending_parts.add(part)
+                self.fetcher.submit(generation, self.fetch_json, (endpoint, params),
+                                    lambda data, part=part, endpoint=endpoint: self.on_weather_loaded(
+                                        part, endpoint, city, data),
+                                    self.on_fetch_error)
+        
+        if self.pending_parts:
+            action = "Refreshing cached" if self.showing_cached else "Fetching"
+            self.status_var.set(f"{action} weather data for {city}... ({self.cache.stats()})")
+        else:
+            elapsed_ms = self.search_finished()
+            self.status_var.set(f"Weather data for {city} loaded from cache in {elapsed_ms:.0f} ms "
+                                f"({self.cache.stats()})")
+    
+    def search_finished(self):
+        # Time from the search to everything rendered, in ms
+        elapsed = time.perf_counter_ns() - self.search_started
+        recorder.record("search", elapsed)
+        return elapsed / 1e6
+    
+    def on_weather_loaded(self, part, endpoint, city, data):
+        self.cache.put(endpoint, city, "metric", data)
+        if not self.render_part(part, data):
+            return
+        
+        self.pending_parts.discard(part)
+        if not self.pending_parts:
+            self.updated_at = time.time()
+            elapsed_ms = self.search_finished()
+            self.status_var.set(f"Weather data for {city} loaded in {elapsed_ms:.0f} ms ({self.cache.stats()})")
+    
+    def render_part(self, part, data):
         try:
-            # Get current weather
-            current_url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={self.api_key}&units={self.units}"
-            response = requests.get(current_url)
-            response.raise_for_status()
-            current_data = response.json()
-            
-            # Get 5-day forecast
-            forecast_url = f"http://api.openweathermap.org/data/2.5/forecast?q={city}&appid={self.api_key}&units={self.units}"
-            response = requests.get(forecast_url)
-            response.raise_for_status()
-            forecast_data = response.json()
-            
-            # Update UI with current weather
-            self.update_current_weather(current_data)
-            
-            # Update forecast
-            self.update_forecast(forecast_data)
-            
-            # Update chart
-            self.update_chart(forecast_data)
-            
-            self.status_var.set(f"Weather data for {city} loaded successfully")
-            
-        except requests.exceptions.RequestException as e:
-            messagebox.showerror("Error", f"Failed to fetch weather data: {e}")
-            self.status_var.set("Error fetching weather data")
+            if part == "current":
+                # Update UI with current weather
+                with span("render.current"):
+                    self.update_current_weather(data)
+                self.current_data = data
+            else:
+                # Parse once, then update forecast and chart from the same model
+                with span("forecast.parse"):
+                    model = ForecastModel.from_json(data)
+                with span("render.forecast"):
+                    self.update_forecast(model)
+                with span("render.chart"):
+                    self.update_chart(model)
+                self.forecast_data = model
         except KeyError as e:
+            self.fetcher.new_generation()
             messagebox.showerror("Error", f"Unexpected data format: {e}")
             self.status_var.set("Error parsing weather data")
+            return False
+        return True
+    
+    def on_fetch_error(self, error):
+        # One failed request fails the search, drop the rest of it. Report it in
+        # the status bar and have the background refresh retry it with backoff,
+        # rather than waiting for its next 3-hour slot.
+        self.fetcher.new_generation()
+        retry_in = self.refresher.retry("city")
+        if self.showing_cached:
+            self.status_var.set(f"Showing cached data, refresh failed: {error} (retrying in {retry_in:.0f} s)")
+            return
+        self.status_var.set(f"Error fetching weather data: {error} (retrying in {retry_in:.0f} s)")
+    
+    def fetch_json(self, endpoint, params):
+        # Conditional GET, so the background refresh can tell when nothing changed
+        return self.provider.get(endpoint, params)[0]
+    
+    def refresh_city(self):
+        # Runs on the refresh thread: network only, rendering happens on the Tk thread
+        city = self.current_city
+        params = {"q": city}
+        parts = []
+        for part, endpoint in (("current", "weather"), ("forecast", "forecast")):
+            data, changed = self.provider.get(endpoint, params)
+            parts.append((part, endpoint, data, changed))
+        return city, parts
+    
+    def on_city_refreshed(self, result):
+        city, parts = result
+        if city != self.current_city:
+            return  # the user searched for somewhere else meanwhile
+        
+        changed = False
+        for part, endpoint, data, part_changed in parts:
+            self.cache.put(endpoint, city, "metric", data)
+            if part_changed:
+                # Only re-render what actually changed upstream
+                changed = True
+                if not self.render_part(part, data):
+                    return
+        self.updated_at = time.time()
+        note = "" if changed else ", no changes"
+        self.status_var.set(f"Auto-refreshed {city} at {datetime.now():%H:%M}{note}")
+    
+    def on_refresh_error(self, error, retry_in):
+        self.status_var.set(f"Auto-refresh failed ({error}), retrying in {retry_in / 60:.1f} min")
+    
+    def check_staleness(self):
+        # Say so when the data on screen is older than the refresh cycle should allow
+        if self.updated_at is not None:
+            age = time.time() - self.updated_at
+            if age > self.refresh_minutes * 60 + JITTER:
+                self.status_var.set(f"Weather data for {self.current_city} is {age / 60:.0f} min old")
+        self.root.after(60 * 1000, self.check_staleness)
     
     def update_current_weather(self, data):
         # Extract data
         city = data['name']
         country = data['sys']['country']
-        temp = data['main']['temp']
-        feels_like = data['main']['feels_like']
+        temp, feels_like = convert_temperature([data['main']['temp'], data['main']['feels_like']], self.units)
         humidity = data['main']['humidity']
         pressure = data['main']['pressure']
-        wind_speed = data['wind']['speed']
+        wind_speed = convert_speed(data['wind']['speed'], self.units)
         description = data['weather'][0]['description'].title()
         visibility = data.get('visibility', 'N/A')
         icon_code = data['weather'][0]['icon']
         
         # Update labels
         self.location_label.config(text=f"{city}, {country}")
-        unit_symbol = "°C" if self.units == "metric" else "°F"
+        unit_symbol = temperature_symbol(self.units)
         self.temp_label.config(text=f"{temp:.1f}{unit_symbol}")
         self.desc_label.config(text=description)
         self.feels_like_label.config(text=f"Feels like: {feels_like:.1f}{unit_symbol}")
         self.humidity_label.config(text=f"Humidity: {humidity}%")
-        self.wind_label.config(text=f"Wind: {wind_speed} m/s")
+        self.wind_label.config(text=f"Wind: {wind_speed:.1f} {speed_symbol(self.units)}")
         self.pressure_label.config(text=f"Pressure: {pressure} hPa")
         
         if visibility != 'N/A':
@@ -222,104 +395,139 @@ class WeatherApp:
         else:
             self.visibility_label.config(text="Visibility: N/A")
         
-        # Load weather icon
-        self.load_weather_icon(icon_code)
+        # Load weather icon, unless it is already showing
+        if icon_code != self.icon_code:
+            self.icon_code = icon_code
+            self.load_weather_icon(icon_code)
     
     def load_weather_icon(self, icon_code):
-        try:
-            # Try to load icon from URL
-            icon_url = f"http://openweathermap.org/img/wn/{icon_code}@2x.png"
-            response = requests.get(icon_url)
-            image_data = response.content
-            image = Image.open(io.BytesIO(image_data))
-            photo = ImageTk.PhotoImage(image)
-            self.weather_icon_label.configure(image=photo)
-            self.weather_icon_label.image = photo
-        except:
-            # If loading fails, just show the icon code
-            self.weather_icon_label.configure(text=icon_code)
+        # Already decoded icons are shown straight away
+        photo = self.icons.photo(icon_code)
+        if photo is not None:
+            self.show_weather_icon(photo)
+            return
+        
+        # Otherwise read or download it off the Tk thread; only the PhotoImage is built here
+        self.icon_fetcher.submit(self.icon_fetcher.generation, self.icons.load, (icon_code,),
+                                 lambda image: self.on_icon_loaded(icon_code),
+                                 lambda error: self.show_icon_error(icon_code))
+    
+    def on_icon_loaded(self, icon_code):
+        # Skip it if the weather moved on to another icon while this one loaded
+        if icon_code == self.icon_code:
+            self.show_weather_icon(self.icons.photo(icon_code))
+    
+    def show_weather_icon(self, photo):
+        self.weather_icon_label.configure(image=photo)
+        self.weather_icon_label.image = photo
+    
+    def show_icon_error(self, icon_code):
+        # If loading fails, just show the icon code; try again on the next update
+        if icon_code != self.icon_code:
+            return
+        self.icon_code = None
+        self.weather_icon_label.configure(image="", text=icon_code)
+    
+    def update_forecast(self, model):
+        # Per-day low, high and most common condition, limited to 5 days
+        daily = model.daily()
+        lows = convert_temperature(daily.low[:5], self.units)
+        highs = convert_temperature(daily.high[:5], self.units)
+        unit_symbol = temperature_symbol(self.units)
+        
+        # Fill one card per day; cards left over are hidden
+        rows = []
+        for start, min_temp, max_temp, condition in zip(daily.start, lows, highs, daily.condition):
+            rows.append((
+                to_datetime(start).strftime('%a, %b %d'),
+                model.labels[condition],
+                f"High: {max_temp:.1f}{unit_symbol}",
+                f"Low: {min_temp:.1f}{unit_symbol}",
+            ))
+        self.cards.show(rows)
+    
+    def create_chart(self):
+        # matplotlib is only imported here, once the window is up
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from weather_chart import ForecastChart
+        
+        self.fig = Figure(figsize=(8, 4), dpi=100)
+        self.chart = ForecastChart(self.fig)
+        self.canvas_chart = FigureCanvasTkAgg(self.fig, self.chart_frame)
+        # draw_idle() renders later through draw(), so that is where the drawing time shows up
+        self.canvas_chart.draw = timed("chart.draw", self.canvas_chart.draw)
+        self.chart_placeholder.destroy()
+        self.canvas_chart.get_tk_widget().grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        if self.chart_model is not None:
+            self.update_chart(self.chart_model)
+    
+    def update_chart(self, model):
+        if self.chart is None:
+            # Build the figure on the first chart after startup, not before the first paint
+            if self.chart_model is None:
+                self.root.after(CHART_DELAY_MS, self.create_chart)
+            self.chart_model = model
+            return
+        
+        # Swap the line data; axes and formatting are only touched when the range changes
+        temps = convert_temperature(model.temps, self.units)
+        self.chart.update(model.datetimes(), temps, temperature_symbol(self.units))
+        
+        # Repaint when Tk is idle, so back-to-back updates render once
+        self.canvas_chart.draw_idle()
+    
+    def open_watchlist(self):
+        if self.watchlist_view is not None:
+            self.watchlist_view.window.lift()
+            return
+        self.watchlist_view = WatchlistView(self.root, self.watchlist_names, self.add_to_watchlist,
+                                            self.remove_from_watchlist, self.refresh_watchlist,
+                                            self.close_watchlist)
+        self.refresh_watchlist()
+    
+    def close_watchlist(self):
+        self.watchlist_fetcher.new_generation()
+        self.watchlist_view.destroy()
+        self.watchlist_view = None
+    
+    def add_to_watchlist(self, name):
+        self.watchlist_names.append(name)
+        self.save_last_city()
+        self.refresh_watchlist()
+    
+    def remove_from_watchlist(self, name):
+        self.watchlist_names.remove(name)
+        self.save_last_city()
+    
+    def refresh_watchlist(self):
+        if not self.watchlist_names:
+            return
+        generation = self.watchlist_fetcher.new_generation()
+        self.watchlist_view.status_label.config(text=f"Fetching {len(self.watchlist_names)} cities...")
+        self.watchlist_fetcher.submit(generation, self.watchlist.fetch_all, (list(self.watchlist_names),),
+                                      self.on_watchlist_loaded, self.on_watchlist_error)
+    
+    def refresh_watchlist_names(self):
+        names = list(self.watchlist_names)
+        return self.watchlist.fetch_all(names) if names else None
     
-    def update_forecast(self, data):
-        # Clear previous forecast
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        # Group forecasts by day
-        forecasts_by_day = {}
-        for forecast in data['list']:
-            date = forecast['dt_txt'].split(' ')[0]
-            if date not in forecasts_by_day:
-                forecasts_by_day[date] = []
-            forecasts_by_day[date].append(forecast)
-        
-        # Display forecast for each day
-        for i, (date, day_forecasts) in enumerate(forecasts_by_day.items()):
-            if i >= 5:  # Limit to 5 days
-                break
-                
-            # Get min and max temp for the day
-            temps = [f['main']['temp'] for f in day_forecasts]
-            min_temp = min(temps)
-            max_temp = max(temps)
-            
-            # Get most common weather condition
-            weather_counts = {}
-            for f in day_forecasts:
-                condition = f['weather'][0]['main']
-                weather_counts[condition] = weather_counts.get(condition, 0) + 1
-            common_weather = max(weather_counts, key=weather_counts.get)
-            
-            # Format date
-            date_obj = datetime.strptime(date, '%Y-%m-%d')
-            formatted_date = date_obj.strftime('%a, %b %d')
-            
-            # Create day frame
-            day_frame = ttk.Frame(self.scrollable_frame, relief="solid", padding="5")
-            day_frame.grid(row=0, column=i, padx=5, pady=5, sticky="nsew")
-            
-            # Add day information
-            ttk.Label(day_frame, text=formatted_date, font=("Arial", 10, "bold")).grid(row=0, column=0, pady=5)
-            ttk.Label(day_frame, text=common_weather).grid(row=1, column=0)
-            
-            unit_symbol = "°C" if self.units == "metric" else "°F"
-            ttk.Label(day_frame, text=f"High: {max_temp:.1f}{unit_symbol}").grid(row=2, column=0)
-            ttk.Label(day_frame, text=f"Low: {min_temp:.1f}{unit_symbol}").grid(row=3, column=0)
+    def on_watchlist_loaded(self, results):
+        if results is None:
+            return
+        self.watchlist_results = results
+        if self.watchlist_view is not None:
+            self.watchlist_view.show(*results, self.units)
     
-    def update_chart(self, data):
-        # Clear previous chart
-        self.ax.clear()
-        
-        # Extract data for chart
-        times = []
-        temps = []
-        
-        for forecast in data['list']:
-            # Convert string to datetime
-            dt = datetime.strptime(forecast['dt_txt'], '%Y-%m-%d %H:%M:%S')
-            times.append(dt)
-            temps.append(forecast['main']['temp'])
-        
-        # Plot data
-        self.ax.plot(times, temps, marker='o', linestyle='-', linewidth=2, markersize=4)
-        
-        # Format x-axis to show dates nicely
-        self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%a %H:%M'))
-        self.ax.xaxis.set_major_locator(mdates.HourLocator(interval=6))
-        self.fig.autofmt_xdate()
-        
-        # Set labels and title
-        unit_symbol = "°C" if self.units == "metric" else "°F"
-        self.ax.set_ylabel(f'Temperature ({unit_symbol})')
-        self.ax.set_title('Temperature Forecast')
-        self.ax.grid(True, linestyle='--', alpha=0.7)
-        
-        # Update canvas
-        self.canvas_chart.draw()
+    def on_watchlist_error(self, error):
+        if self.watchlist_view is not None:
+            self.watchlist_view.status_label.config(text=f"Watchlist update failed: {error}")
     
     def save_last_city(self):
         try:
             with open("weather_app_settings.json", "w") as f:
-                json.dump({"last_city": self.current_city, "units": self.units}, f)
+                json.dump({"last_city": self.current_city, "units": self.units,
+                           "watchlist": self.watchlist_names, "refresh_minutes": self.refresh_minutes}, f)
         except:
             pass  # Silently fail if we can't save settings
     
@@ -331,13 +539,26 @@ class WeatherApp:
                 self.units = settings.get("units", "metric")
                 self.unit_var.set(self.units)
                 self.city_var.set(self.current_city)
+                self.watchlist_names = settings.get("watchlist", [])
+                self.refresh_minutes = settings.get("refresh_minutes", self.refresh_minutes)
         except:
             pass  # Silently fail if we can't load settings
 
 def main():
     root = tk.Tk()
     app = WeatherApp(root)
-    root.mainloop()
+    with profiled():
+        root.mainloop()
+    app.refresher.stop()
+    app.fetcher.shutdown()
+    app.icon_fetcher.shutdown()
+    app.watchlist_fetcher.shutdown()
+    app.watchlist.shutdown()
+    app.provider.close()
+    app.cache.close()
+    path = recorder.dump()
+    if path:
+        print(f"Timings written to {path}")
 
 if __name__ == "__main__":
     main()
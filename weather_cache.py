@@ -0,0 +1,114 @@
+# weather_cache.py
+# Response cache for the OpenWeatherMap calls in weather-app.py. Entries are
+# keyed on (endpoint, city, units), expire after a per-endpoint TTL and are
+# kept in LRU order up to a size bound. Everything is mirrored to a small
+# SQLite file next to weather_app_settings.json so a cold start can show the
+# last data straight away.
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+
+CACHE_PATH = "weather_cache.db"
+TTL = {
+    "weather": 10 * 60,       # current conditions update every ~10 minutes
+    "forecast": 3 * 60 * 60,  # the 5-day forecast only moves in 3-hour steps
+}
+DEFAULT_TTL = 10 * 60
+STALE_FOR = 24 * 60 * 60  # how long an expired entry may still be shown while refreshing
+MAX_ENTRIES = 200
+
+
+class ResponseCache:
+    def __init__(self, path=CACHE_PATH, ttl=None, max_entries=MAX_ENTRIES, stale_for=STALE_FOR, clock=time.time):
+        self.ttl = dict(TTL, **(ttl or {}))
+        self.max_entries = max_entries
+        self.stale_for = stale_for
+        self.clock = clock
+        self.entries = OrderedDict()  # key -> (stored_at, data), least recently used first
+        self.used = {}  # key -> used_at not yet written back; lookups never touch the disk
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    endpoint TEXT NOT NULL,
+                    city TEXT NOT NULL,
+                    units TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    used_at REAL NOT NULL,
+                    body TEXT NOT NULL,
+                    PRIMARY KEY (endpoint, city, units)
+                )
+                """
+            )
+        rows = self.conn.execute(
+            "SELECT endpoint, city, units, stored_at, body FROM responses ORDER BY used_at DESC LIMIT ?",
+            (max_entries,),
+        ).fetchall()
+        for endpoint, city, units, stored_at, body in reversed(rows):
+            self.entries[(endpoint, city, units)] = (stored_at, json.loads(body))
+
+    @staticmethod
+    def key(endpoint, city, units):
+        return endpoint, city.strip().lower(), units
+
+    def get(self, endpoint, city, units):
+        """Return (data, fresh). data is None on a miss; fresh is False for stale data that should be refetched."""
+        key = self.key(endpoint, city, units)
+        entry = self.entries.get(key)
+        now = self.clock()
+        if entry is not None:
+            stored_at, data = entry
+            age = now - stored_at
+            ttl = self.ttl.get(endpoint, DEFAULT_TTL)
+            if age <= ttl + self.stale_for:
+                self.entries.move_to_end(key)
+                self.used[key] = now
+                if age <= ttl:
+                    self.hits += 1
+                    return data, True
+                self.stale_hits += 1
+                return data, False
+        self.misses += 1
+        return None, False
+
+    def put(self, endpoint, city, units, data):
+        key = self.key(endpoint, city, units)
+        now = self.clock()
+        self.entries[key] = (now, data)
+        self.entries.move_to_end(key)
+        evicted = []
+        while len(self.entries) > self.max_entries:
+            evicted.append(self.entries.popitem(last=False)[0])
+        self.used.pop(key, None)
+        with self.conn:
+            self._write_used()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (endpoint, city, units, stored_at, used_at, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, now, now, json.dumps(data)),
+            )
+            self.conn.executemany(
+                "DELETE FROM responses WHERE endpoint = ? AND city = ? AND units = ?", evicted
+            )
+
+    def _write_used(self):
+        # Caller opens the transaction; the LRU order only matters for the next cold start
+        self.conn.executemany(
+            "UPDATE responses SET used_at = ? WHERE endpoint = ? AND city = ? AND units = ?",
+            [(used_at, *key) for key, used_at in self.used.items()],
+        )
+        self.used = {}
+
+    def stats(self):
+        return f"cache: {self.hits} hits, {self.stale_hits} stale, {self.misses} misses"
+
+    def close(self):
+        with self.conn:
+            self._write_used()
+        self.conn.close()
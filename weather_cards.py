@@ -0,0 +1,76 @@
+# weather_cards.py
+# Forecast strip widgets for weather-app.py. Cards are created once and
+# refreshed in place; labels are only reconfigured when their text changes
+# and unused cards are hidden with grid_remove() rather than destroyed, so a
+# refresh causes no widget churn and at most one geometry pass.
+from tkinter import ttk
+
+POOL_SIZE = 5
+CONFIGURE_DEBOUNCE_MS = 50
+
+
+class ForecastCard:
+    def __init__(self, parent, column):
+        self.frame = ttk.Frame(parent, relief="solid", padding="5")
+        self.column = column
+        self.labels = [
+            ttk.Label(self.frame, text="", font=("Arial", 10, "bold")),
+            ttk.Label(self.frame, text=""),
+            ttk.Label(self.frame, text=""),
+            ttk.Label(self.frame, text=""),
+        ]
+        self.labels[0].grid(row=0, column=0, pady=5)
+        for row, label in enumerate(self.labels[1:], start=1):
+            label.grid(row=row, column=0)
+        self.texts = [""] * len(self.labels)
+        self.visible = False
+
+    def show(self, texts):
+        for i, text in enumerate(texts):
+            if text != self.texts[i]:
+                self.labels[i].config(text=text)
+                self.texts[i] = text
+        if not self.visible:
+            self.frame.grid(row=0, column=self.column, padx=5, pady=5, sticky="nsew")
+            self.visible = True
+
+    def hide(self):
+        if self.visible:
+            self.frame.grid_remove()
+            self.visible = False
+
+
+class CardPool:
+    """A row of ForecastCards; grows when asked for more, never shrinks."""
+
+    def __init__(self, parent, size=POOL_SIZE):
+        self.parent = parent
+        self.cards = [ForecastCard(parent, i) for i in range(size)]
+
+    def show(self, rows):
+        """rows: one (date, condition, high, low) tuple of strings per card."""
+        for i, texts in enumerate(rows):
+            if i == len(self.cards):
+                self.cards.append(ForecastCard(self.parent, i))
+            self.cards[i].show(texts)
+        for card in self.cards[len(rows):]:
+            card.hide()
+
+
+class Debouncer:
+    """Collapses a burst of calls into one call, delay_ms after the last of them."""
+
+    def __init__(self, widget, delay_ms, func):
+        self.widget = widget
+        self.delay_ms = delay_ms
+        self.func = func
+        self.pending = None
+
+    def __call__(self, event=None):
+        if self.pending is not None:
+            self.widget.after_cancel(self.pending)
+        self.pending = self.widget.after(self.delay_ms, self.fire)
+
+    def fire(self):
+        self.pending = None
+        self.func()
@@ -0,0 +1,53 @@
+# weather_chart.py
+# Temperature chart for weather-app.py. The axes, formatter, grid and line
+# are set up once; a refresh only swaps the line data and rescales the view
+# when the data range actually moved. The caller repaints with draw_idle(),
+# so several refreshes in one Tk frame cost a single render.
+import math
+
+import matplotlib.dates as mdates
+import numpy as np
+
+
+class ForecastChart:
+    def __init__(self, fig):
+        self.fig = fig
+        self.ax = fig.add_subplot(111)
+        self.ax.xaxis_date()
+        self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%a %H:%M'))
+        self.ax.set_title('Temperature Forecast')
+        self.ax.grid(True, linestyle='--', alpha=0.7)
+        self.line = None
+        self.bounds = None
+        self.unit_symbol = None
+        self.rescales = 0
+
+    def update(self, times, temps, unit_symbol):
+        """Show times (datetime64) against temps. Returns True if the view was rescaled."""
+        if self.line is None:
+            self.line, = self.ax.plot(times, temps, marker='o', linestyle='-', linewidth=2, markersize=4)
+        else:
+            self.line.set_data(times, temps)
+
+        if unit_symbol != self.unit_symbol:
+            self.unit_symbol = unit_symbol
+            self.ax.set_ylabel(f'Temperature ({unit_symbol})')
+
+        if not len(times):
+            return False
+        bounds = (times[0], times[-1], float(np.min(temps)), float(np.max(temps)))
+        if bounds == self.bounds:
+            return False
+        self.bounds = bounds
+        self.rescale(times)
+        return True
+
+    def rescale(self, times):
+        # A tick every 6 hours on the 5-day forecast, proportionally fewer on longer series
+        days = (times[-1] - times[0]) / np.timedelta64(1, 'D')
+        interval = 6 * max(1, math.ceil(days / 5))
+        self.ax.xaxis.set_major_locator(mdates.HourLocator(interval=interval))
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.fig.autofmt_xdate()
+        self.rescales += 1
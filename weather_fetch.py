@@ -0,0 +1,126 @@
+# weather_fetch.py
+# Background fetching for weather-app.py. Network calls run on a small thread
+# pool and their results are handed back to the Tk thread through root.after,
+# so the window keeps repainting while requests are in flight.
+import hashlib
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from weather_perf import span
+
+API_URL = "https://api.openweathermap.org/data/2.5"
+ICON_URL = "https://openweathermap.org/img/wn"
+TIMEOUT = (3.05, 10)  # (connect, read) seconds
+POLL_MS = 20  # how often the Tk thread picks up finished requests
+
+
+class ConditionalFetcher:
+    """GETs JSON with If-None-Match / If-Modified-Since and reports whether it changed.
+
+    get() returns (data, changed). A 304, or a 200 whose body hashes the same
+    as last time, returns the previous data with changed=False so callers can
+    skip re-rendering. Requests go through session, normally the provider's
+    pooled one.
+    """
+
+    def __init__(self, session, timeout=TIMEOUT):
+        self.timeout = timeout
+        self.session = session
+        self.state = {}  # (url, params) -> (etag, last_modified, digest, data)
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None):
+        key = (url, tuple(sorted((params or {}).items())))
+        with self.lock:
+            state = self.state.get(key)
+        headers = {}
+        if state is not None:
+            etag, last_modified, _, _ = state
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        with span("http.get"):
+            response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and state is not None:
+            return state[3], False
+        response.raise_for_status()
+
+        digest = hashlib.sha1(response.content).digest()
+        if state is not None and digest == state[2]:
+            return state[3], False
+        with span("json.decode"):
+            data = response.json()
+        with self.lock:
+            self.state[key] = (response.headers.get("ETag"), response.headers.get("Last-Modified"), digest, data)
+        return data, True
+
+
+class TkDispatcher:
+    """Runs callbacks posted from any thread on the Tk main loop."""
+
+    def __init__(self, root, interval_ms=POLL_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.calls = queue.SimpleQueue()
+        self.root.after(self.interval_ms, self.drain)
+
+    def post(self, func, *args):
+        self.calls.put((func, args))
+
+    def drain(self):
+        while True:
+            try:
+                func, args = self.calls.get_nowait()
+            except queue.Empty:
+                break
+            func(*args)
+        self.root.after(self.interval_ms, self.drain)
+
+
+class FetchPipeline:
+    """Runs fetches concurrently and delivers results for the latest search only.
+
+    Every search starts a new generation. Requests from older generations that
+    haven't started yet are cancelled; ones already on the wire are left to
+    finish (or time out) and their results are dropped.
+    """
+
+    def __init__(self, post, max_workers=4):
+        self.post = post
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="weather-fetch")
+        self.generation = 0
+        self.futures = []
+
+    def new_generation(self):
+        self.generation += 1
+        for future in self.futures:
+            future.cancel()
+        self.futures = []
+        return self.generation
+
+    def submit(self, generation, func, args, on_done, on_error):
+        """Run func(*args) in the pool, then on_done(result) or on_error(exc) on the UI thread."""
+        future = self.executor.submit(func, *args)
+        future.add_done_callback(lambda f: self._deliver(f, generation, on_done, on_error))
+        self.futures.append(future)
+        return future
+
+    def _deliver(self, future, generation, on_done, on_error):
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is None:
+            self.post(self._if_current, generation, on_done, future.result())
+        else:
+            self.post(self._if_current, generation, on_error, exc)
+
+    def _if_current(self, generation, callback, value):
+        if generation == self.generation:
+            callback(value)
+
+    def shutdown(self):
+        self.new_generation()
+        self.executor.shutdown(wait=False, cancel_futures=True)
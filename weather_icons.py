@@ -0,0 +1,123 @@
+# weather_icons.py
+# Icon cache for weather-app.py. OpenWeatherMap only has 18 condition icons,
+# so they are kept at two levels: decoded images (and their PhotoImages) in
+# memory, and the raw PNG bytes in a directory on disk. Once every icon has
+# been seen or prefetched the app never downloads one again, even offline.
+# PIL is imported on first use, which is normally the prefetch thread.
+import contextlib
+import io
+import os
+import tempfile
+import threading
+
+import requests
+
+from weather_perf import span
+
+ICON_DIR = "weather_icons"
+ICON_CODES = [f"{number}{time_of_day}"
+              for number in ("01", "02", "03", "04", "09", "10", "11", "13", "50")
+              for time_of_day in "dn"]
+
+
+class IconCache:
+    """Condition icons from memory, then disk, then the network.
+
+    load() may run on any thread and returns a decoded PIL image. photo()
+    builds Tk PhotoImages and must only be called on the Tk thread.
+    """
+
+    def __init__(self, fetch_icon, directory=ICON_DIR):
+        self.directory = directory
+        self.fetch_icon = fetch_icon  # code -> PNG bytes, normally WeatherProvider.icon
+        self.images = {}  # code -> decoded PIL image
+        self.photos = {}  # code -> ImageTk.PhotoImage
+        self.lock = threading.Lock()
+        self.downloads = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, code):
+        return os.path.join(self.directory, f"{code}@2x.png")
+
+    def load(self, code):
+        from PIL import Image
+
+        with self.lock:
+            image = self.images.get(code)
+        if image is not None:
+            return image
+
+        path = self.path(code)
+        try:
+            with open(path, "rb") as f:
+                image = self.decode(f.read())
+        except (OSError, Image.UnidentifiedImageError):
+            # Missing or damaged on disk: download it and keep the bytes for next time
+            data = self.fetch_icon(code)
+            image = self.decode(data)
+            self.downloads += 1
+            self.save(path, data)
+
+        with self.lock:
+            return self.images.setdefault(code, image)
+
+    def save(self, path, data):
+        # The prefetch thread and an on-demand load can download the same icon
+        # at once, so each writer gets its own temp file; the last replace wins.
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk copy is only a cache: if it can't be written the decoded image is still good
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def decode(data):
+        from PIL import Image
+
+        with span("icon.decode"):
+            image = Image.open(io.BytesIO(data))
+            image.load()
+        return image
+
+    def photo(self, code):
+        """The PhotoImage for code, or None if it hasn't been loaded yet."""
+        photo = self.photos.get(code)
+        if photo is None:
+            with self.lock:
+                image = self.images.get(code)
+            if image is None:
+                return None
+            from PIL import ImageTk
+
+            with span("icon.photo"):
+                photo = self.photos[code] = ImageTk.PhotoImage(image)
+        return photo
+
+    def prefetch(self, codes=ICON_CODES):
+        """Warm the cache in a daemon thread; icons already on disk cost no network."""
+        thread = threading.Thread(target=self._prefetch, args=(list(codes),),
+                                  name="weather-icons", daemon=True)
+        thread.start()
+        return thread
+
+    def _prefetch(self, codes):
+        from PIL import Image
+
+        online = True
+        for code in codes:
+            if not online and not os.path.exists(self.path(code)):
+                continue
+            try:
+                self.load(code)
+            except requests.RequestException:
+                # Offline or rate limited: keep decoding what's on disk, skip the rest
+                online = False
+            except (OSError, Image.UnidentifiedImageError):
+                pass
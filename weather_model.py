@@ -0,0 +1,81 @@
+# weather_model.py
+# Columnar view of an OpenWeatherMap forecast response. The JSON list is
+# parsed once into NumPy arrays (epoch seconds, temperatures in Celsius,
+# condition categories) and the daily summary is computed with array
+# group-bys, so the forecast cards and the chart share one parse step.
+from collections import namedtuple
+
+import numpy as np
+
+DAY = 24 * 60 * 60
+
+DailySummary = namedtuple("DailySummary", "start low high condition")
+
+
+def to_datetimes(seconds):
+    """Epoch seconds -> naive UTC datetime64, which matplotlib plots directly."""
+    return np.asarray(seconds, dtype=np.int64).astype("datetime64[s]")
+
+
+def to_datetime(seconds):
+    return to_datetimes(seconds).item()
+
+
+class ForecastModel:
+    def __init__(self, times, temps, conditions, labels):
+        self.times = times            # int64 epoch seconds, ascending
+        self.temps = temps            # float64 degrees Celsius
+        self.conditions = conditions  # int32 index into labels
+        self.labels = labels          # condition names ("Clear", "Rain", ...)
+        self._daily = None
+
+    @classmethod
+    def from_json(cls, data):
+        entries = data['list']
+        count = len(entries)
+        labels = {}
+        times = np.fromiter((e['dt'] for e in entries), dtype=np.int64, count=count)
+        temps = np.fromiter((e['main']['temp'] for e in entries), dtype=np.float64, count=count)
+        conditions = np.fromiter(
+            (labels.setdefault(e['weather'][0]['main'], len(labels)) for e in entries),
+            dtype=np.int32, count=count,
+        )
+        order = np.argsort(times, kind="stable")
+        return cls(times[order], temps[order], conditions[order], tuple(labels))
+
+    def __len__(self):
+        return len(self.times)
+
+    def datetimes(self):
+        return to_datetimes(self.times)
+
+    def daily(self):
+        """Per UTC day: start, low, high and most common condition."""
+        if self._daily is None:
+            self._daily = self._summarise()
+        return self._daily
+
+    def _summarise(self):
+        if not len(self.times):
+            empty = np.empty(0)
+            return DailySummary(empty.astype(np.int64), empty, empty, empty.astype(np.int32))
+
+        days = self.times // DAY
+        starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        low = np.minimum.reduceat(self.temps, starts)
+        high = np.maximum.reduceat(self.temps, starts)
+
+        # Count (day, condition) pairs in one bincount and take the busiest pair per day;
+        # ties go to the condition that shows up first that day.
+        day_index = np.cumsum(np.r_[False, days[1:] != days[:-1]])
+        width = len(self.labels)
+        size = len(starts) * width
+        keys = day_index * width + self.conditions
+        counts = np.bincount(keys, minlength=size)
+        first = np.full(size, len(keys))
+        seen, first_index = np.unique(keys, return_index=True)
+        first[seen] = first_index
+        score = counts * (len(keys) + 1) - first
+        condition = score.reshape(len(starts), width).argmax(axis=1).astype(np.int32)
+
+        return DailySummary(days[starts] * DAY, low, high, condition)
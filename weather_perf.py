@@ -0,0 +1,274 @@
+# weather_perf.py
+# Timing instrumentation for weather-app.py. Code under a span is timed with
+# perf_counter_ns and lands in a per-name latency histogram with doubling
+# buckets (10 µs, 20 µs, 40 µs, ... ~84 s). Spans are always in the code; with
+# recording off span() hands back a shared no-op context manager and timed()
+# returns the function unchanged, so the cost is a method call per span.
+#
+#   WEATHER_PERF=1          record spans, write them out when the app exits
+#   WEATHER_PERF=overlay    same, with the overlay shown from the start (F12 toggles it)
+#   WEATHER_PERF_OUT=<path> where to write them: *.prom gets Prometheus text,
+#                           anything else JSON (default weather_perf.json)
+#   WEATHER_PROFILE=<path>  run the Tk main loop under cProfile and dump the
+#                           stats there (read with python -m pstats <path>)
+import contextlib
+import json
+import os
+import threading
+import time
+
+BUCKET_BASE_NS = 10_000  # the first bucket holds everything under 10 µs
+BUCKETS = 24  # each bucket doubles the bound; the last one also takes anything slower
+PERF_OUT = "weather_perf.json"
+OVERLAY_INTERVAL_MS = 1000
+
+
+class Histogram:
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.buckets = [0] * BUCKETS
+
+    def add(self, ns):
+        # Caller holds the recorder's lock
+        self.count += 1
+        self.total_ns += ns
+        if self.min_ns is None or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.buckets[min(BUCKETS - 1, (ns // BUCKET_BASE_NS).bit_length())] += 1
+
+    def copy(self):
+        other = Histogram()
+        other.count, other.total_ns, other.min_ns, other.max_ns = self.count, self.total_ns, self.min_ns, self.max_ns
+        other.buckets = list(self.buckets)
+        return other
+
+    def quantile(self, q):
+        """Estimate of the q-th quantile in ns, interpolated inside its bucket like Prometheus does."""
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                # The samples seen so far bound the bucket more tightly than its edges
+                lower = max(self.min_ns, bucket_bound(i - 1) if i else 0)
+                upper = min(self.max_ns, bucket_bound(i) or self.max_ns)
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.max_ns
+
+
+def bucket_bound(i):
+    """Upper bound of bucket i in ns; None for the open-ended last bucket."""
+    return BUCKET_BASE_NS << i if i < BUCKETS - 1 else None
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("recorder", "name", "start")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+
+class Recorder:
+    """Latency histograms by span name; safe to record into from any thread."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def span(self, name):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name)
+
+    def timed(self, name, func):
+        """func wrapped in a span, or func itself while recording is off."""
+        if not self.enabled:
+            return func
+
+        def wrapper(*args, **kwargs):
+            with Span(self, name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def record(self, name, ns):
+        if not self.enabled:
+            return
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(ns)
+
+    def snapshot(self):
+        with self.lock:
+            return {name: h.copy() for name, h in sorted(self.histograms.items())}
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+
+    def summary(self):
+        """One line per span: count and p50 / p95 / max in milliseconds."""
+        lines = [f"{'span':18} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}"]
+        for name, h in self.snapshot().items():
+            lines.append(f"{name:18} {h.count:>6} {h.quantile(0.5) / 1e6:>8.2f} "
+                         f"{h.quantile(0.95) / 1e6:>8.2f} {h.max_ns / 1e6:>8.2f}")
+        return "\n".join(lines)
+
+    def to_json(self):
+        spans = {}
+        for name, h in self.snapshot().items():
+            spans[name] = {
+                "count": h.count,
+                "sum_ms": h.total_ns / 1e6,
+                "min_ms": (h.min_ns or 0) / 1e6,
+                "max_ms": h.max_ns / 1e6,
+                "p50_ms": h.quantile(0.5) / 1e6,
+                "p95_ms": h.quantile(0.95) / 1e6,
+                "p99_ms": h.quantile(0.99) / 1e6,
+                # Bucket upper bound in ms -> samples in that bucket, empty buckets left out
+                "buckets": {("+Inf" if bucket_bound(i) is None else f"{bucket_bound(i) / 1e6:g}"): n
+                            for i, n in enumerate(h.buckets) if n},
+            }
+        return json.dumps({"spans": spans}, indent=2)
+
+    def to_prometheus(self, metric="weather_span_seconds"):
+        lines = [f"# HELP {metric} Time spent in weather-app.py stages.",
+                 f"# TYPE {metric} histogram"]
+        for name, h in self.snapshot().items():
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for i, n in enumerate(h.buckets):
+                cumulative += n
+                bound = bucket_bound(i)
+                le = "+Inf" if bound is None else f"{bound / 1e9:g}"
+                lines.append(f'{metric}_bucket{{span="{label}",le="{le}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{span="{label}"}} {h.total_ns / 1e9:g}')
+            lines.append(f'{metric}_count{{span="{label}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path=None):
+        """Write the histograms to path (WEATHER_PERF_OUT by default); does nothing while off."""
+        if not self.enabled:
+            return None
+        path = path or os.environ.get("WEATHER_PERF_OUT") or PERF_OUT
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+
+recorder = Recorder(enabled=bool(os.environ.get("WEATHER_PERF")))
+span = recorder.span
+timed = recorder.timed
+
+
+def profiled(path=None):
+    """Context manager running its body under cProfile when WEATHER_PROFILE (or path) is set.
+
+    cProfile only follows the thread it was started on, so around the main
+    loop it sees the Tk side: rendering, decoding and callbacks, not the fetch threads.
+    """
+    path = path or os.environ.get("WEATHER_PROFILE")
+    if not path:
+        return contextlib.nullcontext()
+    return _profile(path)
+
+
+@contextlib.contextmanager
+def _profile(path):
+    import cProfile
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
+
+
+class PerfOverlay:
+    """recorder.summary() drawn over the top right corner of root, refreshed once a second."""
+
+    def __init__(self, root, recorder=recorder, interval_ms=OVERLAY_INTERVAL_MS):
+        import tkinter as tk
+
+        self.root = root
+        self.recorder = recorder
+        self.interval_ms = interval_ms
+        self.label = tk.Label(root, font=("Courier", 9), justify=tk.LEFT, anchor=tk.NW,
+                              bg="#202020", fg="#e0e0e0", padx=6, pady=4)
+        self.visible = False
+        self.job = None
+
+    def toggle(self, event=None):
+        if self.visible:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        self.visible = True
+        self.label.place(relx=1.0, rely=0.0, anchor="ne")
+        self.label.lift()
+        self.refresh()
+
+    def hide(self):
+        self.visible = False
+        self.label.place_forget()
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+
+    def refresh(self):
+        # Only polls while it is on screen
+        text = self.recorder.summary() if self.recorder.enabled else "WEATHER_PERF is not set"
+        self.label.config(text=text)
+        self.job = self.root.after(self.interval_ms, self.refresh)
+
+
+def attach_overlay(root):
+    """A PerfOverlay on root toggled with F12 while recording, else None.
+
+    WEATHER_PERF=overlay shows it straight away.
+    """
+    if not recorder.enabled:
+        return None
+    overlay = PerfOverlay(root)
+    root.bind("<F12>", overlay.toggle)
+    if os.environ.get("WEATHER_PERF") == "overlay":
+        overlay.show()
+    return overlay
@@ -0,0 +1,145 @@
+# weather_provider.py
+# Where weather-app.py gets its data from. WeatherProvider talks to
+# OpenWeatherMap over HTTPS through one shared requests.Session, so every
+# call reuses pooled keep-alive connections instead of paying for DNS, TCP
+# and TLS again, and transient failures are retried with backoff.
+# FixtureProvider replays recorded responses from disk for offline runs.
+import json
+import os
+import threading
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from weather_fetch import API_URL, ICON_URL, TIMEOUT, ConditionalFetcher
+from weather_perf import span
+
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+POOL_SIZE = 16  # search, watchlist, refresh and icon threads together
+
+
+def make_session(retries=RETRIES, pool_size=POOL_SIZE, backoff_factor=BACKOFF_FACTOR):
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fixture_path(directory, endpoint, name):
+    return os.path.join(directory, endpoint, f"{quote(name.strip().lower(), safe='')}.json")
+
+
+class WeatherProvider:
+    """OpenWeatherMap over one pooled session.
+
+    get() returns (data, changed) like ConditionalFetcher; data is always in
+    metric units. With record_dir set, every response is also written there
+    in the layout FixtureProvider reads.
+    """
+
+    def __init__(self, api_key, api_url=API_URL, icon_url=ICON_URL, timeout=TIMEOUT,
+                 retries=RETRIES, pool_size=POOL_SIZE, record_dir=None):
+        self.api_key = api_key
+        self.api_url = api_url
+        self.icon_url = icon_url
+        self.timeout = timeout
+        self.session = make_session(retries, pool_size)
+        self.conditional = ConditionalFetcher(self.session, timeout)
+        self.record_dir = record_dir
+
+    def get(self, endpoint, params):
+        data, changed = self.conditional.get(
+            f"{self.api_url}/{endpoint}", dict(params, appid=self.api_key, units="metric")
+        )
+        if changed and self.record_dir:
+            self.record(endpoint, params, data)
+        return data, changed
+
+    def icon(self, code):
+        response = self.session.get(f"{self.icon_url}/{code}@2x.png", timeout=self.timeout)
+        response.raise_for_status()
+        if self.record_dir:
+            os.makedirs(os.path.join(self.record_dir, "icons"), exist_ok=True)
+            with open(os.path.join(self.record_dir, "icons", f"{code}@2x.png"), "wb") as f:
+                f.write(response.content)
+        return response.content
+
+    def record(self, endpoint, params, data):
+        if endpoint == "group":
+            items = [(item["name"], item) for item in data["list"]]
+            endpoint = "weather"
+        else:
+            items = [(params["q"], data)]
+        os.makedirs(os.path.join(self.record_dir, endpoint), exist_ok=True)
+        for name, item in items:
+            with open(fixture_path(self.record_dir, endpoint, name), "w") as f:
+                json.dump(item, f)
+
+    def close(self):
+        self.session.close()
+
+
+class FixtureProvider:
+    """Replays responses recorded by WeatherProvider(record_dir=...), no network.
+
+    Layout: weather/<city>.json, forecast/<city>.json, icons/<code>@2x.png.
+    A missing fixture raises FileNotFoundError, which the app treats like any
+    other failed request.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.seen = set()
+        self.lock = threading.Lock()
+
+    def get(self, endpoint, params):
+        if endpoint == "group":
+            data = self.group([int(i) for i in params["id"].split(",") if i])
+            key = (endpoint, params["id"])
+        else:
+            with span("fixture.load"), open(fixture_path(self.directory, endpoint, params["q"]), "r") as f:
+                data = json.load(f)
+            key = (endpoint, params["q"].strip().lower())
+        # The same recording never changes: only the first answer counts as new
+        with self.lock:
+            changed = key not in self.seen
+            self.seen.add(key)
+        return data, changed
+
+    def group(self, ids):
+        wanted = set(ids)
+        items = []
+        weather_dir = os.path.join(self.directory, "weather")
+        for filename in sorted(os.listdir(weather_dir)):
+            with open(os.path.join(weather_dir, filename), "r") as f:
+                item = json.load(f)
+            if item.get("id") in wanted:
+                items.append(item)
+        return {"cnt": len(items), "list": items}
+
+    def icon(self, code):
+        with open(os.path.join(self.directory, "icons", f"{code}@2x.png"), "rb") as f:
+            return f.read()
+
+    def close(self):
+        pass
+
+
+def open_provider(api_key):
+    """WEATHER_FIXTURES=<dir> replays recordings; WEATHER_RECORD=<dir> records live responses."""
+    fixtures = os.environ.get("WEATHER_FIXTURES")
+    if fixtures:
+        return FixtureProvider(fixtures)
+    return WeatherProvider(api_key, record_dir=os.environ.get("WEATHER_RECORD"))
@@ -0,0 +1,167 @@
+# weather_refresh.py
+# Background auto-refresh for weather-app.py. Each job runs on a single
+# worker thread at the next multiple of its interval (measured from the
+# epoch, so a 3-hour interval lands on the forecast's own 3-hour steps) plus
+# a random jitter, so many clients don't all poll on the boundary. Failures
+# retry with exponential backoff. Jobs are kept in a min-heap by due time.
+import heapq
+import itertools
+import random
+import threading
+import time
+
+INTERVAL = 3 * 60 * 60  # the forecast only changes in 3-hour steps
+JITTER = 5 * 60
+BACKOFF_BASE = 30
+BACKOFF_MAX = 30 * 60
+MAX_SLEEP = 60
+
+
+def next_aligned(now, interval):
+    """The first multiple of interval (in epoch seconds) after now."""
+    return (now // interval + 1) * interval
+
+
+class RefreshJob:
+    def __init__(self, key, func, on_result, on_error, interval):
+        self.key = key
+        self.func = func
+        self.on_result = on_result
+        self.on_error = on_error
+        self.interval = interval
+        self.failures = 0
+        self.due = None
+
+
+class RefreshScheduler:
+    """Runs func() for every job on schedule; on_result(result) / on_error(exc, retry_in) follow on the worker."""
+
+    def __init__(self, interval=INTERVAL, jitter=JITTER, clock=time.time, rng=None):
+        self.interval = interval
+        self.jitter = jitter
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.cond = threading.Condition()
+        self.jobs = {}  # key -> RefreshJob
+        self.heap = []  # (due, seq, key, job); entries for replaced jobs are skipped
+        self.seq = itertools.count()
+        self.running = False
+        self.thread = None
+
+    def add(self, key, func, on_result, on_error, interval=None, run_now=False):
+        """Schedule func under key, replacing any job already using that key."""
+        with self.cond:
+            job = RefreshJob(key, func, on_result, on_error, interval or self.interval)
+            self.jobs[key] = job
+            now = self.clock()
+            self._push(job, now if run_now else self._next_due(job, now))
+            self.cond.notify()
+            return job
+
+    def remove(self, key):
+        with self.cond:
+            self.jobs.pop(key, None)
+
+    def refresh_now(self, key):
+        with self.cond:
+            job = self.jobs.get(key)
+            if job is not None:
+                self._push(job, self.clock())
+                self.cond.notify()
+
+    def retry(self, key):
+        """Count a failure of key's work done outside the scheduler and run the job again after the backoff.
+
+        Returns the delay in seconds, or None if there is no such job. A run
+        already due sooner is kept.
+        """
+        with self.cond:
+            job = self.jobs.get(key)
+            if job is None:
+                return None
+            job.failures += 1
+            retry_in = self._backoff(job)
+            due = self.clock() + retry_in
+            if job.due is None or due < job.due:
+                self._push(job, due)
+                self.cond.notify()
+            return retry_in
+
+    def _next_due(self, job, now):
+        return next_aligned(now, job.interval) + self.rng.uniform(0, self.jitter)
+
+    def _backoff(self, job):
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (job.failures - 1))
+        return delay * self.rng.uniform(0.5, 1.0)
+
+    def _push(self, job, due):
+        job.due = due
+        heapq.heappush(self.heap, (due, next(self.seq), job.key, job))
+
+    def _pop_ready(self, now):
+        # Caller holds the lock
+        while self.heap:
+            due, _, key, job = self.heap[0]
+            if self.jobs.get(key) is not job or job.due != due:
+                heapq.heappop(self.heap)  # replaced, removed or rescheduled
+                continue
+            if due > now:
+                return None
+            heapq.heappop(self.heap)
+            return job
+        return None
+
+    def next_deadline(self):
+        with self.cond:
+            self._pop_ready(float("-inf"))  # drops dead entries at the top
+            return self.heap[0][0] if self.heap else None
+
+    def _run(self, job):
+        try:
+            result = job.func()
+        except Exception as e:
+            with self.cond:
+                job.failures += 1
+                retry_in = self._backoff(job)
+                if self.jobs.get(job.key) is job:
+                    self._push(job, self.clock() + retry_in)
+            job.on_error(e, retry_in)
+            return
+        with self.cond:
+            job.failures = 0
+            if self.jobs.get(job.key) is job:
+                self._push(job, self._next_due(job, self.clock()))
+        job.on_result(result)
+
+    def run_pending(self):
+        """Run every job that is due now, without blocking."""
+        while True:
+            with self.cond:
+                job = self._pop_ready(self.clock())
+            if job is None:
+                return
+            self._run(job)
+
+    def run_forever(self):
+        while True:
+            with self.cond:
+                if not self.running:
+                    return
+                job = self._pop_ready(self.clock())
+                if job is None:
+                    timeout = MAX_SLEEP
+                    if self.heap:
+                        timeout = min(timeout, max(0, self.heap[0][0] - self.clock()))
+                    self.cond.wait(timeout)
+                    continue
+            self._run(job)
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run_forever, name="weather-refresh", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
@@ -0,0 +1,29 @@
+# weather_units.py
+# weather-app.py always fetches metric data and converts it locally, so
+# switching between Celsius and Fahrenheit never goes back to the network.
+# Conversions accept scalars or sequences and work on whole NumPy arrays.
+import numpy as np
+
+MPS_TO_MPH = 2.2369362920544
+
+
+def convert_temperature(celsius, units):
+    values = np.asarray(celsius, dtype=float)
+    if units == "imperial":
+        return values * 1.8 + 32.0
+    return values
+
+
+def convert_speed(meters_per_second, units):
+    values = np.asarray(meters_per_second, dtype=float)
+    if units == "imperial":
+        return values * MPS_TO_MPH
+    return values
+
+
+def temperature_symbol(units):
+    return "°F" if units == "imperial" else "°C"
+
+
+def speed_symbol(units):
+    return "mph" if units == "imperial" else "m/s"
@@ -0,0 +1,187 @@
+# weather_watchlist.py
+# Watchlist mode for weather-app.py: current conditions for many cities at
+# once. City names are resolved to OpenWeatherMap ids a single time (the ids
+# are kept in weather_city_ids.json), after which the whole list is fetched
+# through the group endpoint, 20 ids per request, on a bounded thread pool.
+import json
+import os
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk
+
+from weather_units import convert_speed, convert_temperature, speed_symbol, temperature_symbol
+
+IDS_PATH = "weather_city_ids.json"
+GROUP_SIZE = 20  # the group endpoint's limit
+MAX_WORKERS = 4
+
+
+def chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class CityIds:
+    """City name -> OpenWeatherMap id, saved to disk so names are looked up once."""
+
+    def __init__(self, path=IDS_PATH):
+        self.path = path
+        try:
+            with open(path, "r") as f:
+                self.ids = json.load(f)
+        except (OSError, ValueError):
+            self.ids = {}
+
+    @staticmethod
+    def key(name):
+        return name.strip().lower()
+
+    def get(self, name):
+        return self.ids.get(self.key(name))
+
+    def add(self, name, city_id):
+        self.ids[self.key(name)] = city_id
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.ids, f)
+        os.replace(tmp_path, self.path)
+
+
+class Watchlist:
+    """Fetches current weather (metric) for a list of city names through a weather provider."""
+
+    def __init__(self, provider, ids=None, max_workers=MAX_WORKERS):
+        self.provider = provider
+        self.ids = ids if ids is not None else CityIds()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="weather-watchlist")
+        self.lock = threading.Lock()  # manual and background refreshes share the id cache
+
+    def fetch_all(self, names):
+        """Return (results, errors): name -> current weather payload, name -> exception."""
+        with self.lock:
+            return self._fetch_all(names)
+
+    def _fetch_all(self, names):
+        results = {}
+        errors = {}
+
+        # Unknown names go through /weather once; its answer is already the current weather
+        unknown = [name for name in names if self.ids.get(name) is None]
+        lookups = [(name, self.executor.submit(self._get, "weather", {"q": name})) for name in unknown]
+        for name, future in lookups:
+            try:
+                data = future.result()
+            except Exception as e:
+                errors[name] = e
+                continue
+            self.ids.add(name, data["id"])
+            results[name] = data
+        if lookups:
+            self.ids.save()
+
+        # Everything else in batches of GROUP_SIZE ids
+        by_id = {}
+        for name in names:
+            if name not in results and name not in errors:
+                by_id.setdefault(self.ids.get(name), []).append(name)
+        batches = [
+            (batch, self.executor.submit(self._get, "group", {"id": ",".join(str(i) for i in batch)}))
+            for batch in chunks(list(by_id), GROUP_SIZE)
+        ]
+        for batch, future in batches:
+            try:
+                data = future.result()
+            except Exception as e:
+                for city_id in batch:
+                    for name in by_id[city_id]:
+                        errors[name] = e
+                continue
+            for item in data["list"]:
+                for name in by_id.get(item["id"], ()):
+                    results[name] = item
+
+        return results, errors
+
+    def _get(self, endpoint, params):
+        return self.provider.get(endpoint, params)[0]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class WatchlistView:
+    """A window with one compact row per watched city."""
+
+    COLUMNS = ("temp", "conditions", "humidity", "wind")
+
+    def __init__(self, root, names, on_add, on_remove, on_refresh, on_close):
+        self.window = tk.Toplevel(root)
+        self.window.title("Watchlist")
+        self.window.geometry("520x400")
+        self.window.protocol("WM_DELETE_WINDOW", on_close)
+        self.window.columnconfigure(0, weight=1)
+        self.window.rowconfigure(1, weight=1)
+
+        controls = ttk.Frame(self.window, padding="5")
+        controls.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        controls.columnconfigure(0, weight=1)
+        self.city_var = tk.StringVar()
+        entry = ttk.Entry(controls, textvariable=self.city_var)
+        entry.grid(row=0, column=0, padx=5, sticky=(tk.W, tk.E))
+        entry.bind('<Return>', lambda e: self.add(on_add))
+        ttk.Button(controls, text="Add", command=lambda: self.add(on_add)).grid(row=0, column=1, padx=2)
+        ttk.Button(controls, text="Remove", command=lambda: self.remove(on_remove)).grid(row=0, column=2, padx=2)
+        ttk.Button(controls, text="Refresh", command=on_refresh).grid(row=0, column=3, padx=2)
+
+        self.tree = ttk.Treeview(self.window, columns=self.COLUMNS, height=15)
+        self.tree.heading("#0", text="City")
+        self.tree.column("#0", width=150)
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=column.title())
+            self.tree.column(column, width=90, anchor="center")
+        self.tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        scrollbar = ttk.Scrollbar(self.window, orient="vertical", command=self.tree.yview)
+        scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self.status_label = ttk.Label(self.window, text="", padding="5")
+        self.status_label.grid(row=2, column=0, columnspan=2, sticky=tk.W)
+
+        for name in names:
+            self.tree.insert("", "end", iid=name, text=name, values=("…", "", "", ""))
+
+    def add(self, on_add):
+        name = self.city_var.get().strip()
+        if name and not self.tree.exists(name):
+            self.tree.insert("", "end", iid=name, text=name, values=("…", "", "", ""))
+            self.city_var.set("")
+            on_add(name)
+
+    def remove(self, on_remove):
+        for name in self.tree.selection():
+            self.tree.delete(name)
+            on_remove(name)
+
+    def show(self, results, errors, units):
+        unit_symbol = temperature_symbol(units)
+        for name, data in results.items():
+            if not self.tree.exists(name):
+                continue
+            temp = convert_temperature(data['main']['temp'], units)
+            wind = convert_speed(data['wind']['speed'], units)
+            self.tree.item(name, values=(
+                f"{temp:.1f}{unit_symbol}",
+                data['weather'][0]['description'].capitalize(),
+                f"{data['main']['humidity']}%",
+                f"{wind:.1f} {speed_symbol(units)}",
+            ))
+        for name in errors:
+            if self.tree.exists(name):
+                self.tree.item(name, values=("error", "", "", ""))
+        self.status_label.config(text=f"{len(results)} cities updated, {len(errors)} failed")
+
+    def destroy(self):
+        self.window.destroy()